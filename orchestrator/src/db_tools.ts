@@ -262,11 +262,15 @@ export async function cleanupFulfilledEntriesAdvanced(
     try {
         await client.query('BEGIN');
 
-        // Fetch all entries with a request_id
+        // Fetch all entries with a request_id. Puzzles handed out by the puzzle-tool's issuing
+        // service (request_id 'issued:<id>') belong to its callers, and lazily generated ones
+        // ('lazy:<id>') wait for their output; neither is cleaned up here.
         const result = await client.query(`
             SELECT id, request_id, detected_completed 
             FROM time_lock_puzzles 
             WHERE request_id IS NOT NULL
+            AND request_id NOT LIKE 'issued:%'
+            AND request_id NOT LIKE 'lazy:%'
         `);
 
         let markForDeletion: string[] = [];
@@ -1,5 +1,37 @@
 import sys
 import os
 
+import pytest
+from sqlalchemy import create_engine
+
 # Add the project root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Point the database layer at a fresh SQLite file with the full schema (triggers included)."""
+    from src.database import database as database_module
+    from src.database.entity import TimeLockPuzzleEntity  # noqa: F401 (registers the models)
+    from src.database.initialize_db import ensure_schema
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(database_module, "_engine", engine)
+    database_module.Base.metadata.create_all(engine)
+    ensure_schema(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def add_puzzles(database):
+    """Save `count` synthetic (unsolvable) puzzles with their RSA keys; returns the entities."""
+    from src.database.DatabaseService import DatabaseService
+    from src.database.benchmark_writers import synthetic_entities
+
+    def add(count):
+        entities = synthetic_entities(count)
+        DatabaseService.save_many(entities)
+        return entities
+
+    return add
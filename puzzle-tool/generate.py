@@ -1,38 +1,67 @@
 """Main script for generating and persisting time lock puzzles."""
 
 import argparse
+import hashlib
+import os
+import socket
 import time
-from typing import List, Tuple
+import uuid
+from typing import List, Optional, Tuple
 
 from src.converters.rsa_converter import RSAConverter
 from src.converters.time_lock_puzzle_converter import TimeLockPuzzleConverter
 from src.database.DatabaseService import DatabaseService
+from src.database.GenerationJobService import GenerationJobService, LeaseHeartbeat
+from src.database.constants import LAZY_OUTPUT, PARTITIONED
+from src.database.database import get_engine
+from src.database.partitions import ensure_partitions, maintain_partitions
 from src.database.entity.RSAEntity import RSAEntity
 from src.database.entity.TimeLockPuzzleEntity import TimeLockPuzzleEntity
 from src.mpc import MPC
 from src.mpc.types import MPZ
 from src.protocol_constants import BIT_SIZE, TIMING_PARAMETER
+from src.random import Random
 from src.rsa.RSA import RSA
 from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
 from src.time_lock_puzzle.TimeLockPuzzleFactory import TimeLockPuzzleFactory
+from src.utils.BackgroundPolicy import BackgroundPolicy
 
 
 class TimeLockPuzzleService:
     """Service class for managing time lock puzzle operations."""
 
-    def __init__(self, bit_size: int, timing_parameter: MPC.mpz):
+    def __init__(
+        self,
+        bit_size: int,
+        timing_parameter: MPC.mpz,
+        lazy_output: bool = False,
+        background_policy: Optional[BackgroundPolicy] = None,
+        writers: int = 1,
+        write_batch_size: int = 500,
+    ):
         """
         Initialize the service.
 
         Args:
             bit_size: Size for RSA parameters
             timing_parameter: Number of squarings required
+            lazy_output: Skip computing and storing y (derived on read by LazyOutputResolver)
+            background_policy: Run generation within this CPU budget (None for full speed)
+            writers: Writer connections used by save_entities (1 saves in a single transaction)
+            write_batch_size: Entities per transaction when saving with several writers
         """
-        self.factory = TimeLockPuzzleFactory(bit_size, timing_parameter)
+        self.factory = TimeLockPuzzleFactory(
+            bit_size,
+            timing_parameter,
+            compute_output=not lazy_output,
+            background_policy=background_policy,
+        )
         self.rsa_converter = RSAConverter()
         self.puzzle_converter = TimeLockPuzzleConverter()
+        self.writers = writers
+        self.write_batch_size = write_batch_size
 
-    def generate_puzzles(self, amount: int) -> List[Tuple[TimeLockPuzzle, RSA, MPZ]]:
+    def generate_puzzles(self, amount: int) -> List[Tuple[TimeLockPuzzle, RSA, Optional[MPZ]]]:
         """
         Generate multiple time lock puzzles.
 
@@ -51,7 +80,7 @@ class TimeLockPuzzleService:
         return puzzles
 
     def convert_to_entities(
-        self, puzzles: List[Tuple[TimeLockPuzzle, RSA, MPZ]]
+        self, puzzles: List[Tuple[TimeLockPuzzle, RSA, Optional[MPZ]]]
     ) -> List[TimeLockPuzzleEntity | RSAEntity]:
         """
         Convert puzzles and RSAs to database entities.
@@ -69,7 +98,9 @@ class TimeLockPuzzleService:
             # Convert RSA entity first to get its ID (now generated on creation)
             rsa_entity = self.rsa_converter.to_entity(rsa)
             # Create puzzle entity with the generated RSA ID
-            puzzle_entity = self.puzzle_converter.to_entity(puzzle, rsa_entity.id, y)
+            puzzle_entity = self.puzzle_converter.to_entity(
+                puzzle, rsa_entity.id, y, rsa_entity.created_at
+            )
             entities.extend([rsa_entity, puzzle_entity])
         total_time = time.time() - start_time
         print(f"Entity conversion took {total_time:.2f} seconds")
@@ -84,29 +115,250 @@ class TimeLockPuzzleService:
         """
         print("\nSaving to database...")
         start_time = time.time()
-        # Now we can save all entities at once since RSA IDs are generated on creation
-        DatabaseService.save_many(entities)
+        if self.writers > 1:
+            writer_stats = DatabaseService.save_partitioned(
+                entities, self.writers, self.write_batch_size
+            )
+            for stats in writer_stats:
+                print(
+                    f"  Writer {stats.writer}: {stats.rows} rows in {stats.commits} commits, "
+                    f"{stats.rows_per_second:,.0f} rows/s, commit p50 "
+                    f"{stats.latency_percentile(50) * 1000:.1f} ms, "
+                    f"p99 {stats.latency_percentile(99) * 1000:.1f} ms"
+                )
+        else:
+            # Now we can save all entities at once since RSA IDs are generated on creation
+            DatabaseService.save_many(entities)
         total_time = time.time() - start_time
         print(f"Database save took {total_time:.2f} seconds")
 
 
+def run_worker(
+    service: TimeLockPuzzleService, lease_seconds: float, follow: bool, poll_seconds: float
+) -> None:
+    """
+    Lease generation jobs from the database and generate them until none are left.
+
+    Any number of workers on any number of nodes can run this against the same database.
+
+    Args:
+        service: Service used to generate and convert each chunk
+        lease_seconds: Lease duration; renewed by a heartbeat while the chunk is generated
+        follow: Keep polling for new jobs instead of exiting when none are left
+        poll_seconds: Delay between polls when no job is available
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    print(f"Worker {owner} started")
+    while True:
+        if PARTITIONED:
+            maintain_partitions(get_engine())  # A --follow worker can outlive its partitions
+        job = GenerationJobService.lease(owner, lease_seconds)
+        if job is None:
+            if not follow:
+                break
+            time.sleep(poll_seconds)
+            continue
+
+        print(f"\nLeased job {job.id} ({job.amount} puzzles, attempt {job.attempts})")
+        heartbeat = LeaseHeartbeat(job.id, owner, lease_seconds)
+        heartbeat.start()
+        try:
+            entities = service.convert_to_entities(service.generate_puzzles(job.amount))
+        finally:
+            heartbeat.stop()
+
+        if not heartbeat.lost and GenerationJobService.complete(job.id, owner, entities):
+            print(f"Committed job {job.id}")
+        else:
+            print(f"Lease on job {job.id} was lost; discarded its output")
+
+    print(f"\nNo jobs left. Progress: {GenerationJobService.progress()}")
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Generate and save time lock puzzles.")
     parser.add_argument(
         "count",
         type=int,
-        help="Number of time lock puzzles to generate",
+        nargs="?",
+        help="Number of time lock puzzles to generate (or to enqueue, with --enqueue)",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Split count into generation jobs for workers instead of generating locally",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10,
+        help="Puzzles per generation job (with --enqueue)",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Lease and generate jobs from the generation_jobs table",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300,
+        help="Job lease duration; expired leases are taken over by other workers",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="In worker mode, keep polling for new jobs instead of exiting when none are left",
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=5,
+        help="In worker mode with --follow, delay between polls for new jobs",
+    )
+    parser.add_argument(
+        "--lazy-output",
+        action="store_true",
+        help="Do not compute or store y; it is derived from p and q when first read through "
+        "reveal.py or LazyOutputResolver. Requires LAZY_OUTPUT=true. The puzzles are held out "
+        "of the orchestrator's pool until `reveal.py --release` stores their y",
+    )
+    parser.add_argument(
+        "--background",
+        action="store_true",
+        help="Generate at low priority within a CPU budget, away from reserved cores",
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=float,
+        default=0.4,
+        help="With --background, fraction of the node's CPUs generation may use",
+    )
+    parser.add_argument(
+        "--reserved-cores",
+        type=int,
+        default=1,
+        help="With --background, number of cores kept free for the solver",
+    )
+    parser.add_argument(
+        "--nice",
+        type=int,
+        default=19,
+        help="With --background, niceness increment for generation workers",
+    )
+    parser.add_argument(
+        "--max-load",
+        type=float,
+        default=0.8,
+        help="With --background, pause while other processes load the node above this fraction",
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        default=1,
+        help="Save over this many writer connections, partitioned by RSA key (1 for a single "
+        "transaction)",
+    )
+    parser.add_argument(
+        "--write-batch-size",
+        type=int,
+        default=500,
+        help="With --writers above 1, entities per writer transaction",
+    )
+    parser.add_argument(
+        "--benchmark-seed",
+        type=int,
+        default=None,
+        help="INSECURE: derive all randomness from this seed so runs are reproducible, for "
+        "benchmarking only. Nothing is saved.",
+    )
+    args = parser.parse_args()
+    if args.count is None and not args.worker:
+        parser.error("count is required unless --worker is given")
+    if args.count is not None and args.count < 1:
+        parser.error("count must be positive")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+    if args.benchmark_seed is not None and (args.enqueue or args.worker):
+        parser.error("--benchmark-seed generates locally and saves nothing")
+    if args.lazy_output and not LAZY_OUTPUT:
+        parser.error("--lazy-output requires LAZY_OUTPUT=true (also when running initialize_db.py)")
+    return args
+
+
+def run_benchmark(service: TimeLockPuzzleService, count: int, seed: int) -> None:
+    """
+    Generate puzzles from a fixed seed without saving them.
+
+    Two runs with the same seed and count do the same work, so their timings can be compared
+    directly; the printed fingerprint confirms that they did.
+
+    Args:
+        service: Service used to generate the puzzles
+        count: Number of puzzles to generate
+        seed: Benchmark seed
+    """
+    print("!" * 80)
+    print("INSECURE BENCHMARK MODE: puzzles are derived from a known seed and are solvable by")
+    print("anyone. They are NOT saved; every database save is refused in this process.")
+    print("!" * 80)
+    Random.enable_insecure_benchmark_mode(seed)
+    puzzles = service.generate_puzzles(count)
+
+    fingerprint = hashlib.sha256()
+    for puzzle, _, _ in puzzles:
+        fingerprint.update(f"{puzzle.get_x():x}:{puzzle.get_N():x};".encode())
+    print(f"Seed {seed}, {count} puzzles, fingerprint {fingerprint.hexdigest()[:16]}")
 
 
 def main() -> None:
     """Generate time lock puzzles and save them to the database."""
     args = parse_args()
 
+    if args.enqueue:
+        batch_id = GenerationJobService.enqueue(args.count, args.chunk_size)
+        print(f"Enqueued {args.count} puzzles in chunks of {args.chunk_size} (batch {batch_id})")
+        return
+
     # Initialize service
-    service = TimeLockPuzzleService(BIT_SIZE, TIMING_PARAMETER)
+    background_policy = None
+    if args.background:
+        background_policy = BackgroundPolicy(
+            cpu_budget=args.cpu_budget,
+            reserved_cores=args.reserved_cores,
+            nice=args.nice,
+            max_load=args.max_load,
+        )
+        print(
+            f"Background mode: {background_policy.get_num_workers()} workers on cores "
+            f"{background_policy.get_worker_cores()} at "
+            f"{background_policy.get_duty_cycle():.0%} duty cycle"
+        )
+    if args.lazy_output:
+        print(
+            "Note: --lazy-output stores puzzles without y, held out of the pool; the orchestrator "
+            "can only claim them after `reveal.py --release` stored their y."
+        )
+    service = TimeLockPuzzleService(
+        BIT_SIZE,
+        TIMING_PARAMETER,
+        lazy_output=args.lazy_output,
+        background_policy=background_policy,
+        writers=args.writers,
+        write_batch_size=args.write_batch_size,
+    )
+
+    if args.benchmark_seed is not None:
+        run_benchmark(service, args.count, args.benchmark_seed)
+        return
+
+    if PARTITIONED:
+        ensure_partitions(get_engine())  # Upcoming partitions exist before puzzles land in them
+
+    if args.worker:
+        run_worker(service, args.lease_seconds, args.follow, args.poll_seconds)
+        return
 
     # Generate puzzles
     puzzles = service.generate_puzzles(args.count)
@@ -0,0 +1,55 @@
+"""Script for moving the unassigned puzzle pool to a new timing parameter without new keys."""
+
+import argparse
+import sys
+
+from src.database.PuzzleRetargeter import PuzzleRetargeter
+from src.protocol_constants import TIMING_PARAMETER
+from src.utils.SystemSpecs import SystemSpecs
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Recompute the output of every unassigned puzzle for a new timing parameter "
+        "from its stored RSA trapdoor, keeping the keys."
+    )
+    parser.add_argument(
+        "--t",
+        type=int,
+        default=int(TIMING_PARAMETER),
+        help="New number of squarings (defaults to TIMING_PARAMETER)",
+    )
+    parser.add_argument(
+        "--redraw-x",
+        action="store_true",
+        help="Also draw a fresh input x for every puzzle",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SystemSpecs.get_num_parallel_processes(),
+        help="Worker processes, each updating batches over its own connection",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Puzzles per update transaction"
+    )
+    args = parser.parse_args()
+    if args.t < 1:
+        parser.error("--t must be positive")
+    return args
+
+
+def main() -> None:
+    """Retarget the pool and print what was updated."""
+    args = parse_args()
+    print(f"Retargeting unassigned puzzles to t={args.t} with {args.workers} worker(s)...")
+    retargeter = PuzzleRetargeter(args.workers, args.batch_size, redraw_x=args.redraw_x)
+    report = retargeter.retarget(args.t)
+    print(report)
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
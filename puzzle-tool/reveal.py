@@ -0,0 +1,51 @@
+"""Script for reading a stored puzzle's output, deriving it if it was generated lazily."""
+
+import argparse
+
+from src.database.LazyOutputResolver import LazyOutputResolver
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Print the output y of a stored time lock puzzle (using its RSA trapdoor)."
+    )
+    parser.add_argument(
+        "puzzle_id",
+        type=str,
+        nargs="?",
+        help="ID of the time lock puzzle",
+    )
+    parser.add_argument(
+        "--write-back",
+        action="store_true",
+        help="Store a derived y on the puzzle row",
+    )
+    parser.add_argument(
+        "--release",
+        action="store_true",
+        help="Instead of one puzzle, store y on every puzzle generated with --lazy-output, "
+        "releasing them into the pool the orchestrator claims from",
+    )
+    args = parser.parse_args()
+    if (args.puzzle_id is None) != args.release:
+        parser.error("pass either a puzzle_id or --release")
+    return args
+
+
+def main() -> int:
+    """Print the output of a puzzle."""
+    args = parse_args()
+    if args.release:
+        print(f"Released {LazyOutputResolver().release_held()} puzzles into the pool")
+        return 0
+    y_hex = LazyOutputResolver(cache_size=1, write_back=args.write_back).get_output(args.puzzle_id)
+    if y_hex is None:
+        print(f"No puzzle with id {args.puzzle_id}")
+        return 1
+    print(f"y = 0x{y_hex}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
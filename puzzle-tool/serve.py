@@ -0,0 +1,86 @@
+"""Script for running the local puzzle-issuing service."""
+
+import argparse
+import asyncio
+import signal
+
+from src.protocol_constants import BIT_SIZE, TIMING_PARAMETER
+from src.service.JsonHttpServer import JsonHttpServer
+from src.service.PuzzleIssuingService import PuzzleIssuingService
+from src.utils.SystemSpecs import SystemSpecs
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve time lock puzzles from an in-memory buffer kept full in the background."
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--unix-socket",
+        type=str,
+        default=None,
+        help="Listen on this Unix socket path instead of TCP",
+    )
+    parser.add_argument(
+        "--capacity", type=int, default=64, help="Maximum puzzles held in the buffer"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SystemSpecs.get_num_parallel_processes(),
+        help="Generator processes refilling the buffer",
+    )
+    parser.add_argument(
+        "--persist-batch-size",
+        type=int,
+        default=32,
+        help="Generated puzzles written per database transaction",
+    )
+    parser.add_argument(
+        "--persist-interval",
+        type=float,
+        default=1.0,
+        help="Maximum seconds a generated puzzle waits to be persisted before it can be issued",
+    )
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run the service until SIGINT/SIGTERM, then drop the puzzles that were never issued."""
+    service = PuzzleIssuingService(
+        BIT_SIZE,
+        TIMING_PARAMETER,
+        capacity=args.capacity,
+        workers=args.workers,
+        persist_batch_size=args.persist_batch_size,
+        persist_interval=args.persist_interval,
+    )
+    server = JsonHttpServer(service.routes())
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await service.start()
+    await server.start(args.host, args.port, args.unix_socket)
+    print(f"Serving puzzles on {args.unix_socket or f'http://{args.host}:{args.port}'}")
+    print("  GET /puzzles?count=n   issue up to n buffered puzzles")
+    print("  GET /stats             buffer depth and counters")
+
+    await stop_event.wait()
+    print("\nShutting down...")
+    await server.stop()
+    await service.stop()
+    print("Done!")
+
+
+def main() -> None:
+    """Start the puzzle-issuing service."""
+    asyncio.run(serve(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
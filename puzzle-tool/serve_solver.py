@@ -0,0 +1,84 @@
+"""Script for running the local solver service."""
+
+import argparse
+import asyncio
+import signal
+
+from src.service.JsonHttpServer import JsonHttpServer
+from src.service.ResultCache import ResultCache
+from src.service.SolverService import SolverService
+from src.time_lock_puzzle.SolverHandle import DEFAULT_STEP
+from src.utils.SystemSpecs import SystemSpecs
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Solve time lock puzzles as a service, sharing in-flight jobs and results."
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    parser.add_argument(
+        "--unix-socket",
+        type=str,
+        default=None,
+        help="Listen on this Unix socket path instead of TCP",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SystemSpecs.get_num_parallel_processes(),
+        help="Maximum puzzles solved at the same time",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=".solver_cache",
+        help="Directory of the on-disk result cache",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=64,
+        help="Maximum size of the result cache in MB; least recently used results are evicted",
+    )
+    parser.add_argument(
+        "--step",
+        type=int,
+        default=DEFAULT_STEP,
+        help="Squarings between progress updates of a running job",
+    )
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run the service until SIGINT/SIGTERM."""
+    cache = ResultCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    service = SolverService(cache, workers=args.workers, step=args.step)
+    server = JsonHttpServer(service.routes())
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await service.start()
+    await server.start(args.host, args.port, args.unix_socket)
+    print(f"Solving puzzles on {args.unix_socket or f'http://{args.host}:{args.port}'}")
+    print("  GET /solve?x=<hex>&t=<int>&N=<hex>[&wait=0]   solve, or return the known result")
+    print("  GET /stats                                    queue depth, jobs and cache")
+
+    await stop_event.wait()
+    print("\nShutting down...")
+    await server.stop()
+    await service.stop()
+    print("Done!")
+
+
+def main() -> None:
+    """Start the solver service."""
+    asyncio.run(serve(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
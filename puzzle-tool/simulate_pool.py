@@ -0,0 +1,403 @@
+"""Script for sizing the puzzle pool: replays request arrivals against a stand-in database."""
+
+import argparse
+import csv
+import os
+import random
+import shlex
+import subprocess
+import sys
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Tuple
+
+from src.database.DatabaseService import DatabaseService
+from src.database.PartitionedWriter import latency_percentile
+from src.database.benchmark_writers import synthetic_entities
+from src.database.initialize_db import initialize_database
+
+_RETRY_SECONDS = 0.05  # Pause between claim attempts while requests wait for puzzles
+_TIMELINE_ROWS = 20  # Rows of the printed depth timeline
+_GENERATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generate.py")
+
+
+def poisson_arrivals(rate: float, duration: float, rng: random.Random) -> List[float]:
+    """
+    Arrival times of a Poisson process.
+
+    Args:
+        rate: Mean requests per second
+        duration: Length of the stream in seconds
+        rng: Source of the exponential gaps
+
+    Returns:
+        Ascending arrival times in seconds from the start
+    """
+    arrivals = []
+    now = rng.expovariate(rate)
+    while now < duration:
+        arrivals.append(now)
+        now += rng.expovariate(rate)
+    return arrivals
+
+
+def bursty_arrivals(
+    rate: float,
+    burst_rate: float,
+    burst_seconds: float,
+    burst_every: float,
+    duration: float,
+    rng: random.Random,
+) -> List[float]:
+    """
+    Arrival times of a Poisson process whose rate jumps to `burst_rate` for `burst_seconds` at
+    the start of every `burst_every` seconds.
+
+    Args:
+        rate: Mean requests per second between bursts
+        burst_rate: Mean requests per second during a burst
+        burst_seconds: Length of each burst
+        burst_every: Period of the bursts
+        duration: Length of the stream in seconds
+        rng: Source of the exponential gaps
+
+    Returns:
+        Ascending arrival times in seconds from the start
+    """
+    arrivals = []
+    period_start = 0.0
+    while period_start < duration:
+        burst_end = min(period_start + burst_seconds, duration)
+        period_end = min(period_start + burst_every, duration)
+        for start, end, period_rate in (
+            (period_start, burst_end, burst_rate),
+            (burst_end, period_end, rate),
+        ):
+            if period_rate > 0:
+                arrivals.extend(start + t for t in poisson_arrivals(period_rate, end - start, rng))
+        period_start += burst_every
+    return arrivals
+
+
+def trace_arrivals(path: str, duration: Optional[float]) -> List[float]:
+    """
+    Arrival times read from a trace file: one timestamp in seconds per line (e.g. Unix time of
+    each request). Blank lines and lines starting with # are ignored.
+
+    Args:
+        path: Trace file
+        duration: Only replay this many seconds from the first arrival (None for all)
+
+    Returns:
+        Ascending arrival times in seconds from the first one
+    """
+    with open(path) as trace:
+        stamps = sorted(
+            float(line) for line in (line.strip() for line in trace) if line and line[0] != "#"
+        )
+    arrivals = [stamp - stamps[0] for stamp in stamps] if stamps else []
+    if duration is not None:
+        arrivals = [arrival for arrival in arrivals if arrival < duration]
+    return arrivals
+
+
+@dataclass
+class SimulationReport:
+    """Pool depth, stockouts and claim latencies of a simulation run."""
+
+    requests: int = 0
+    timeline: List[Tuple[float, int, int, int]] = field(
+        default_factory=list
+    )  # (seconds, unassigned puzzles, waiting requests, running generators)
+    latencies: List[float] = field(default_factory=list)  # Arrival to puzzle, seconds
+    claim_seconds: List[float] = field(default_factory=list)  # Per claim query
+    stockouts: List[float] = field(default_factory=list)  # Length of each stockout, seconds
+    refills: List[Tuple[int, float]] = field(default_factory=list)  # (puzzles, seconds)
+    failed_refills: int = 0
+    elapsed_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        lines = [f"{'t (s)':>8} {'depth':>7} {'waiting':>7} {'generators':>10}"]
+        step = max(1, -(-len(self.timeline) // _TIMELINE_ROWS))  # ceil
+        deepest = max((depth for _, depth, _, _ in self.timeline), default=0) or 1
+        for seconds, depth, waiting, generators in self.timeline[::step]:
+            bar = "#" * round(40 * depth / deepest)
+            lines.append(f"{seconds:8.1f} {depth:7d} {waiting:7d} {generators:10d}  {bar}")
+
+        lines.append(f"\n{self.requests} requests in {self.elapsed_seconds:.1f} seconds")
+        if self.stockouts:
+            lines.append(
+                f"Stockouts: {len(self.stockouts)}, {sum(self.stockouts):.1f} seconds in total, "
+                f"longest {max(self.stockouts):.1f} seconds"
+            )
+        else:
+            lines.append("Stockouts: none")
+        lines.append(
+            "Claim latency (arrival to puzzle): "
+            + ", ".join(
+                f"p{p} {latency_percentile(self.latencies, p) * 1000:.1f} ms"
+                for p in (50, 90, 99, 99.9)
+            )
+            + f", max {max(self.latencies, default=0.0) * 1000:.1f} ms"
+        )
+        lines.append(
+            f"Claim query: p50 {latency_percentile(self.claim_seconds, 50) * 1000:.1f} ms, "
+            f"p99 {latency_percentile(self.claim_seconds, 99) * 1000:.1f} ms"
+        )
+        if self.refills:
+            puzzles = sum(count for count, _ in self.refills)
+            seconds = sum(duration for _, duration in self.refills)
+            lines.append(
+                f"Refills: {len(self.refills)} of {puzzles} puzzles in total, "
+                f"{puzzles / seconds:.2f} puzzles/s per generator, "
+                f"{seconds / len(self.refills):.1f} seconds each on average"
+            )
+        if self.failed_refills:
+            lines.append(f"Failed refills: {self.failed_refills}")
+        return "\n".join(lines)
+
+
+class PoolSimulator:
+    """Claims puzzles for an arrival stream while generate.py refills the pool on a watermark.
+
+    Requests are claimed in arrival order; a request that finds the pool empty waits and is
+    retried until a refill serves it, so its latency includes the stockout. Every `poll_seconds`
+    the pool depth is read from the pool_stats counters, and a refill (`generate.py
+    <refill_batch>`) is started while the unassigned puzzles plus those still being generated
+    are below `low_watermark` and fewer than `generators` refills are running.
+    """
+
+    def __init__(
+        self,
+        low_watermark: int,
+        refill_batch: int,
+        generators: int = 1,
+        generator_args: Optional[List[str]] = None,
+        poll_seconds: float = 1.0,
+    ) -> None:
+        """Initialize the simulator.
+
+        Args:
+            low_watermark: Refill while fewer puzzles than this are unassigned or on their way
+            refill_batch: Puzzles generated per refill
+            generators: Refills allowed to run at once
+            generator_args: Extra command line arguments for generate.py
+            poll_seconds: Interval of pool depth samples and refill decisions
+        """
+        self._low_watermark = low_watermark
+        self._refill_batch = refill_batch
+        self._generators = generators
+        self._generator_args = generator_args or []
+        self._poll_seconds = poll_seconds
+        self._running: List[Tuple[subprocess.Popen, float]] = []  # (refill, start time)
+
+    def run(self, arrivals: List[float]) -> SimulationReport:
+        """Replay an arrival stream in real time.
+
+        Args:
+            arrivals: Ascending arrival times in seconds from the start
+
+        Returns:
+            SimulationReport: What the stream saw
+        """
+        report = SimulationReport(requests=len(arrivals))
+        run_id = uuid.uuid4().hex[:8]
+        upcoming = deque(arrivals)
+        waiting: Deque[Tuple[str, float]] = deque()  # (request id, arrival time)
+        stockout_start: Optional[float] = None
+        next_poll = 0.0
+        start = time.perf_counter()
+
+        while upcoming or waiting:
+            now = time.perf_counter() - start
+            while upcoming and upcoming[0] <= now:
+                waiting.append((f"sim-{run_id}-{report.requests - len(upcoming)}", upcoming[0]))
+                upcoming.popleft()
+
+            if waiting:
+                claim_start = time.perf_counter()
+                served = DatabaseService.claim([request_id for request_id, _ in waiting])
+                claimed_at = time.perf_counter() - start
+                report.claim_seconds.append(time.perf_counter() - claim_start)
+                while waiting and waiting[0][0] in served:
+                    report.latencies.append(claimed_at - waiting.popleft()[1])
+                if waiting and stockout_start is None:
+                    stockout_start = claimed_at
+                elif not waiting and stockout_start is not None:
+                    report.stockouts.append(claimed_at - stockout_start)
+                    stockout_start = None
+
+            if now >= next_poll:
+                self._poll(report, now, len(waiting))
+                next_poll += self._poll_seconds
+
+            wake = next_poll
+            if upcoming:
+                wake = min(wake, upcoming[0])
+            if waiting:
+                wake = min(wake, now + _RETRY_SECONDS)
+            time.sleep(max(0.0, wake - (time.perf_counter() - start)))
+
+        report.elapsed_seconds = time.perf_counter() - start
+        if self._running:
+            print(f"Waiting for {len(self._running)} running refill(s)...")
+            for process, _ in self._running:
+                process.wait()
+            self._reap(report)
+        return report
+
+    def _poll(self, report: SimulationReport, now: float, waiting: int) -> None:
+        """Samples the pool depth and starts refills as the watermark policy requires."""
+        self._reap(report)
+        depth = DatabaseService.pool_stats()["unassigned"]
+        report.timeline.append((now, depth, waiting, len(self._running)))
+        while (
+            len(self._running) < self._generators
+            and depth + len(self._running) * self._refill_batch < self._low_watermark
+        ):
+            process = subprocess.Popen(
+                [sys.executable, _GENERATE, str(self._refill_batch), *self._generator_args],
+                cwd=os.path.dirname(_GENERATE),
+                stdout=subprocess.DEVNULL,
+            )
+            self._running.append((process, time.perf_counter()))
+
+    def _reap(self, report: SimulationReport) -> None:
+        """Records the refills that have finished."""
+        running = []
+        for process, started in self._running:
+            if process.poll() is None:
+                running.append((process, started))
+            elif process.returncode == 0:
+                report.refills.append((self._refill_batch, time.perf_counter() - started))
+            else:
+                report.failed_refills += 1
+        self._running = running
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Replay a request arrival stream against a stand-in database while "
+        "generate.py refills the pool, and report pool depth, stockouts and claim latency."
+    )
+    parser.add_argument(
+        "--arrivals",
+        choices=["poisson", "bursty", "trace"],
+        default="poisson",
+        help="Arrival stream to replay",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=1.0, help="Requests per second (between bursts if bursty)"
+    )
+    parser.add_argument(
+        "--burst-rate", type=float, default=10.0, help="Requests per second during a burst"
+    )
+    parser.add_argument(
+        "--burst-seconds", type=float, default=10.0, help="Length of each burst"
+    )
+    parser.add_argument(
+        "--burst-every", type=float, default=60.0, help="Seconds from one burst to the next"
+    )
+    parser.add_argument(
+        "--trace", type=str, help="Trace file with one arrival timestamp in seconds per line"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Seconds of arrivals to replay (default 300; the whole trace with --arrivals trace)",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="Seed of the synthetic arrival stream (random if unset)"
+    )
+    parser.add_argument(
+        "--low-watermark",
+        type=int,
+        default=100,
+        help="Start a refill while fewer puzzles are unassigned or being generated",
+    )
+    parser.add_argument(
+        "--refill-batch", type=int, default=50, help="Puzzles generated per refill"
+    )
+    parser.add_argument(
+        "--generators", type=int, default=1, help="Refills (generate.py runs) allowed at once"
+    )
+    parser.add_argument(
+        "--generator-args",
+        type=str,
+        default="",
+        help='Extra arguments for generate.py, e.g. "--background --cpu-budget 0.5"',
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=1.0,
+        help="Interval of pool depth samples and refill decisions",
+    )
+    parser.add_argument(
+        "--prefill",
+        type=int,
+        default=0,
+        help="Synthetic (unsolvable) puzzles saved before the run starts",
+    )
+    parser.add_argument("--csv", type=str, help="Write every pool depth sample to this file")
+    parser.add_argument(
+        "--stand-in",
+        action="store_true",
+        help="Confirm the configured database is a stand-in; the run claims its puzzles",
+    )
+    args = parser.parse_args()
+    if not args.stand_in:
+        parser.error("point DATABASE_* at a stand-in database and pass --stand-in")
+    if args.arrivals == "trace" and not args.trace:
+        parser.error("--arrivals trace requires --trace")
+    if args.arrivals != "trace" and args.duration is None:
+        args.duration = 300.0
+    if args.low_watermark < 1:
+        parser.error("--low-watermark must be at least 1")
+    return args
+
+
+def main() -> None:
+    """Run the simulation and print the report."""
+    args = parse_args()
+    rng = random.Random(args.seed)
+    if args.arrivals == "poisson":
+        arrivals = poisson_arrivals(args.rate, args.duration, rng)
+    elif args.arrivals == "bursty":
+        arrivals = bursty_arrivals(
+            args.rate, args.burst_rate, args.burst_seconds, args.burst_every, args.duration, rng
+        )
+    else:
+        arrivals = trace_arrivals(args.trace, args.duration)
+
+    initialize_database()  # Tables and the pool_stats triggers the depth samples read
+    if args.prefill:
+        DatabaseService.save_many(synthetic_entities(args.prefill))
+
+    print(
+        f"Replaying {len(arrivals)} {args.arrivals} arrivals; refilling {args.refill_batch} "
+        f"puzzles below {args.low_watermark} with up to {args.generators} generator(s)..."
+    )
+    simulator = PoolSimulator(
+        args.low_watermark,
+        args.refill_batch,
+        args.generators,
+        shlex.split(args.generator_args),
+        args.poll_seconds,
+    )
+    report = simulator.run(arrivals)
+    print(report)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(["seconds", "unassigned", "waiting", "generators"])
+            writer.writerows(report.timeline)
+        print(f"Pool depth samples written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
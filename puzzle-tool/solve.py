@@ -1,12 +1,14 @@
 """Script for solving time lock puzzles without the private key."""
 
 import argparse
+import asyncio
 import time
 
 from src.mpc import MPC
 from src.mpc.types import MPZ
 from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
 from src.time_lock_puzzle.SequentialTimeLockPuzzleSolver import SequentialTimeLockPuzzleSolver
+from src.time_lock_puzzle.SolverHandle import SolverHandle
 
 
 def parse_args() -> argparse.Namespace:
@@ -29,7 +31,44 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="The modulus N (hex string)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Solve in a worker process and print progress with rate and ETA",
+    )
+    parser.add_argument(
+        "--milestones",
+        type=str,
+        default=None,
+        help="Comma-separated extra numbers of squarings (e.g. 1000,5000) to output on the way "
+        "to t, in the same squaring pass",
+    )
+    args = parser.parse_args()
+    if args.milestones is not None:
+        if args.progress:
+            parser.error("--milestones cannot be combined with --progress")
+        try:
+            milestones = {int(m) for m in args.milestones.split(",") if m.strip()}
+        except ValueError:
+            parser.error("--milestones must be comma-separated integers")
+        if not milestones:
+            parser.error("--milestones must list at least one number of squarings")
+        if min(milestones) < 1 or max(milestones) > args.t:
+            parser.error(f"--milestones must be between 1 and t={args.t}")
+        args.milestones = sorted(milestones | {args.t})
+    return args
+
+
+async def solve_with_progress(puzzle: TimeLockPuzzle) -> MPZ:
+    """Solve a puzzle through a SolverHandle, printing its progress events."""
+    handle = SolverHandle.start(puzzle)
+    async for event in handle.progress():
+        eta = f"{event.eta_seconds:.1f}s" if event.eta_seconds is not None else "?"
+        print(
+            f"  {event.squarings_done}/{event.squarings_total} squarings "
+            f"({event.rate:,.0f}/s, ETA {eta})"
+        )
+    return await handle.result()
 
 
 def main() -> None:
@@ -54,7 +93,19 @@ def main() -> None:
     print("This may take a while...")
     start_time = time.time()
 
-    solution = SequentialTimeLockPuzzleSolver.solve(puzzle)
+    if args.milestones is not None:
+        solutions = SequentialTimeLockPuzzleSolver.solve_milestones(puzzle, args.milestones)
+        total_time = time.time() - start_time
+
+        print(f"\nSolutions found in {total_time:.2f} seconds")
+        for milestone, solution in zip(args.milestones, solutions):
+            print(f"t = {milestone}: y = {hex(solution)}")
+        return
+
+    if args.progress:
+        solution = asyncio.run(solve_with_progress(puzzle))
+    else:
+        solution = SequentialTimeLockPuzzleSolver.solve(puzzle)
 
     total_time = time.time() - start_time
 
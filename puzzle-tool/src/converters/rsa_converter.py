@@ -17,9 +17,11 @@ class RSAConverter:
         Returns:
             RSAEntity: The database entity
         """
-        return RSAEntity(
+        entity = RSAEntity(
             hex(rsa.get_p())[2:],  # remove 0x
             hex(rsa.get_q())[2:],  # remove 0x
             hex(rsa.get_N())[2:],  # remove 0x
             hex(rsa.get_phi())[2:],  # remove 0x
         )
+        entity.insecure_benchmark = rsa.is_insecure()
+        return entity
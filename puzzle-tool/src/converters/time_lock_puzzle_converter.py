@@ -1,5 +1,8 @@
 """Converter for time lock puzzle objects."""
 
+from datetime import datetime
+from typing import Optional
+
 from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
 from src.database.entity.TimeLockPuzzleEntity import TimeLockPuzzleEntity
 from src.mpc.types import MPZ
@@ -9,21 +12,30 @@ class TimeLockPuzzleConverter:
     """Converter between TimeLockPuzzle and TimeLockPuzzleEntity."""
 
     @staticmethod
-    def to_entity(puzzle: TimeLockPuzzle, rsa_id: str, y: MPZ) -> TimeLockPuzzleEntity:
+    def to_entity(
+        puzzle: TimeLockPuzzle,
+        rsa_id: str,
+        y: Optional[MPZ],
+        created_at: Optional[datetime] = None,
+    ) -> TimeLockPuzzleEntity:
         """Convert a TimeLockPuzzle to a TimeLockPuzzleEntity.
 
         Args:
             puzzle (TimeLockPuzzle): The puzzle to convert
             rsa_id (str): ID of the associated RSA entity
-            y (MPZ): The y value from the puzzle tuple
+            y (Optional[MPZ]): The y value from the puzzle tuple (None in lazy output mode)
+            created_at (Optional[datetime]): Creation time of the associated RSA entity
 
         Returns:
             TimeLockPuzzleEntity: The database entity
         """
-        return TimeLockPuzzleEntity(
+        entity = TimeLockPuzzleEntity(
             x_hex=hex(puzzle.get_x())[2:],  # remove 0x
-            y_hex=hex(y)[2:],  # remove 0x
+            y_hex=hex(y)[2:] if y is not None else None,  # remove 0x
             t=str(puzzle.get_t()),  # remove 0x
             N_hex=hex(puzzle.get_N())[2:],  # remove 0x
             rsa_id=rsa_id,
+            created_at=created_at,
         )
+        entity.insecure_benchmark = puzzle.is_insecure()
+        return entity
@@ -1,5 +1,81 @@
-from typing import List
+from typing import Dict, List
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.exc import IntegrityError
+
+from .database import is_postgresql, save_instances, session_scope
+from .entity.PoolStatsEntity import PoolStatsEntity
 from .mixins.saveable import Saveable
+from .PartitionedWriter import PartitionedWriter, WriterStats
+
+# Serializes claims for the same request ids: each claimer takes transaction-scoped advisory
+# locks on its request ids in one global order, so the claim statement that follows (with a fresh
+# snapshot) sees every assignment committed by an overlapping claim.
+_LOCK_REQUESTS_SQL_POSTGRESQL = text(
+    """
+    SELECT pg_advisory_xact_lock(locks.key)
+    FROM (
+        SELECT DISTINCT hashtext(r.request_id) AS key
+        FROM unnest(CAST(:request_ids AS TEXT[])) AS r(request_id)
+        ORDER BY key
+    ) AS locks
+    """
+)
+
+# Attempts of a claim that lost a race for a request id to a writer outside claim() (e.g. the
+# orchestrator); the unique request_id index turns such a race into an IntegrityError
+_CLAIM_ATTEMPTS = 3
+
+# Pairs the i-th unseen request id with the i-th free puzzle and assigns the whole batch in one
+# statement. Free rows are picked off the partial unassigned index and locked with SKIP LOCKED,
+# so concurrent claimers never wait on each other and never see the same row. The trailing
+# SELECT runs on the pre-update snapshot and reports requests that were already assigned.
+_CLAIM_SQL_POSTGRESQL = text(
+    """
+    WITH claimed AS (
+        UPDATE time_lock_puzzles AS tlp
+        SET request_id = pairs.request_id
+        FROM (
+            SELECT free.id, req.request_id
+            FROM (
+                SELECT locked.id, row_number() OVER (ORDER BY locked.id) AS rn
+                FROM (
+                    SELECT id FROM time_lock_puzzles
+                    WHERE request_id IS NULL
+                    ORDER BY id
+                    LIMIT :amount
+                    FOR UPDATE SKIP LOCKED
+                ) AS locked
+            ) AS free
+            JOIN (
+                SELECT r.request_id, row_number() OVER (ORDER BY r.ord) AS rn
+                FROM unnest(CAST(:request_ids AS TEXT[])) WITH ORDINALITY AS r(request_id, ord)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM time_lock_puzzles assigned
+                    WHERE assigned.request_id = r.request_id
+                )
+            ) AS req ON req.rn = free.rn
+        ) AS pairs
+        WHERE tlp.id = pairs.id
+        RETURNING pairs.request_id, tlp.id
+    )
+    SELECT request_id, id FROM claimed
+    UNION ALL
+    SELECT request_id, id FROM time_lock_puzzles
+    WHERE request_id = ANY(CAST(:request_ids AS TEXT[]))
+    """
+)
+
+_CLAIM_ONE_SQL_SQLITE = text(
+    """
+    UPDATE time_lock_puzzles
+    SET request_id = :request_id
+    WHERE id = (
+        SELECT id FROM time_lock_puzzles WHERE request_id IS NULL ORDER BY id LIMIT 1
+    )
+    AND NOT EXISTS (SELECT 1 FROM time_lock_puzzles WHERE request_id = :request_id)
+    """
+)
 
 
 class DatabaseService:
@@ -8,10 +84,107 @@ class DatabaseService:
     @staticmethod
     def save_many(instances: List[Saveable]) -> None:
         """
-        Save multiple instances to the database.
+        Save multiple instances to the database in a single transaction.
 
         Args:
             instances: List of Saveable instances to save
         """
-        for instance in instances:
-            instance.save()
+        save_instances(instances)
+
+    @staticmethod
+    def save_partitioned(
+        instances: List[Saveable], writers: int, batch_size: int = 500
+    ) -> List[WriterStats]:
+        """
+        Save instances over several writer connections that commit independently.
+
+        Unlike save_many this is not one transaction: each writer commits its own batches.
+
+        Args:
+            instances: RSA and puzzle entities, each RSA key before its puzzle
+            writers: Number of writer connections
+            batch_size: Entities per transaction
+
+        Returns:
+            Throughput and commit latency of each writer
+        """
+        return PartitionedWriter(writers, batch_size).write(instances)
+
+    @staticmethod
+    def claim(request_ids: List[str]) -> Dict[str, str]:
+        """
+        Assign unassigned puzzles to a batch of randomness requests.
+
+        Request ids that already own a puzzle are left untouched, so retrying a batch is safe,
+        also while an earlier attempt is still running: claims for the same request id are
+        serialized, and (unless the tables are partitioned) the unique request_id index rejects a
+        second puzzle for a request id whoever assigns it. If the pool runs short, only the first
+        request ids (in the given order) are served.
+
+        Args:
+            request_ids: Request ids to assign puzzles to
+
+        Returns:
+            Mapping of request id -> puzzle id for every given request that holds a puzzle
+            after the call, whether it was claimed now or by an earlier call
+        """
+        request_ids = list(dict.fromkeys(request_ids))  # de-duplicate, keep order
+        if not request_ids:
+            return {}
+
+        for attempt in range(_CLAIM_ATTEMPTS):
+            try:
+                return DatabaseService._claim_once(request_ids)
+            except IntegrityError:
+                # Another writer assigned one of the request ids meanwhile; the retry sees it
+                if attempt == _CLAIM_ATTEMPTS - 1:
+                    raise
+
+    @staticmethod
+    def _claim_once(request_ids: List[str]) -> Dict[str, str]:
+        """One claim transaction for de-duplicated request ids (see claim)."""
+        with session_scope() as session:
+            if is_postgresql():
+                session.execute(_LOCK_REQUESTS_SQL_POSTGRESQL, {"request_ids": request_ids})
+                rows = session.execute(
+                    _CLAIM_SQL_POSTGRESQL,
+                    {"request_ids": request_ids, "amount": len(request_ids)},
+                ).all()
+                return {request_id: str(puzzle_id) for request_id, puzzle_id in rows}
+
+            # SQLite has no SKIP LOCKED; its first write takes the database-wide write lock, so
+            # per-request conditional updates inside one transaction are already race free.
+            session.execute(
+                _CLAIM_ONE_SQL_SQLITE,
+                [{"request_id": request_id} for request_id in request_ids],
+            )
+            rows = session.execute(
+                text(
+                    "SELECT request_id, id FROM time_lock_puzzles WHERE request_id IN :request_ids"
+                ).bindparams(bindparam("request_ids", expanding=True)),
+                {"request_ids": request_ids},
+            ).all()
+            return {request_id: str(puzzle_id) for request_id, puzzle_id in rows}
+
+    @staticmethod
+    def pool_stats() -> Dict[str, int]:
+        """
+        Read the pool counters kept up to date by the pool_stats triggers.
+
+        Costs a lookup of a few counter rows however large the pool is, unlike a COUNT(*).
+
+        Returns:
+            Number of puzzles in total, unassigned and assigned
+        """
+        with session_scope() as session:
+            total, unassigned = session.execute(
+                select(
+                    func.coalesce(func.sum(PoolStatsEntity.total), 0),
+                    func.coalesce(func.sum(PoolStatsEntity.unassigned), 0),
+                )
+            ).one()
+        return {
+            "total": int(total),
+            "unassigned": int(unassigned),
+            "assigned": int(total) - int(unassigned),
+        }
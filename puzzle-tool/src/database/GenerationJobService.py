@@ -0,0 +1,220 @@
+"""Lease-based coordination of puzzle generation across any number of worker processes."""
+
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, or_, select, update
+
+from .database import check_persistable, session_scope
+from .entity.GenerationJobEntity import GenerationJobEntity, JOB_DONE, JOB_LEASED, JOB_PENDING
+from .entity.RSAEntity import RSAEntity
+from .entity.TimeLockPuzzleEntity import TimeLockPuzzleEntity
+
+# How many leasable jobs a lease attempt looks at before giving up on a contended round
+_LEASE_CANDIDATES = 8
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, matching the DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _leasable(now: datetime):
+    """Jobs nobody works on: never leased, or whose lease ran out (crashed or stalled worker)."""
+    return or_(
+        GenerationJobEntity.status == JOB_PENDING,
+        (GenerationJobEntity.status == JOB_LEASED) & (GenerationJobEntity.lease_expires_at < now),
+    )
+
+
+class GenerationJobService:
+    """Service class for the `generation_jobs` table.
+
+    A target count is split into chunks (jobs). Workers lease a chunk, keep the lease alive with
+    heartbeats while generating, and commit the chunk's puzzles in the same transaction that marks
+    the job done, fenced on still owning the lease. A chunk's output is therefore stored exactly
+    once: a worker whose lease was taken over cannot commit, and a crashed worker's chunk is
+    re-leased once its lease expires.
+    """
+
+    @staticmethod
+    def enqueue(target: int, chunk_size: int) -> str:
+        """
+        Split a target puzzle count into pending jobs.
+
+        Args:
+            target: Total number of puzzles to generate
+            chunk_size: Maximum puzzles per job
+
+        Returns:
+            ID of the batch grouping the jobs
+        """
+        if target < 1 or chunk_size < 1:
+            raise ValueError("target and chunk_size must be positive")
+        batch_id = str(uuid.uuid4())
+        jobs = [
+            GenerationJobEntity(batch_id, min(chunk_size, target - start))
+            for start in range(0, target, chunk_size)
+        ]
+        with session_scope() as session:
+            session.add_all(jobs)
+        return batch_id
+
+    @staticmethod
+    def lease(owner: str, lease_seconds: float) -> Optional[GenerationJobEntity]:
+        """
+        Lease the oldest job nobody is working on.
+
+        On PostgreSQL candidates are locked with SKIP LOCKED, so concurrent workers never contend
+        for the same row. The conditional update additionally makes the lease a compare-and-set,
+        which is what keeps it race free on SQLite.
+
+        Args:
+            owner: Unique name of the leasing worker
+            lease_seconds: How long the lease lasts without a heartbeat
+
+        Returns:
+            The leased job, or None if every job is done or leased
+        """
+        with session_scope() as session:
+            now = _utcnow()
+            candidates = session.execute(
+                select(GenerationJobEntity.id)
+                .where(_leasable(now))
+                .order_by(GenerationJobEntity.created_at)
+                .limit(_LEASE_CANDIDATES)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            for job_id in candidates:
+                leased = session.execute(
+                    update(GenerationJobEntity)
+                    .where(GenerationJobEntity.id == job_id)
+                    .where(_leasable(now))
+                    .values(
+                        status=JOB_LEASED,
+                        lease_owner=owner,
+                        lease_expires_at=now + timedelta(seconds=lease_seconds),
+                        attempts=GenerationJobEntity.attempts + 1,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if leased:
+                    return session.execute(
+                        select(GenerationJobEntity).where(GenerationJobEntity.id == job_id)
+                    ).scalar_one()
+        return None
+
+    @staticmethod
+    def heartbeat(job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Extend a lease.
+
+        Args:
+            job_id: ID of the leased job
+            owner: Worker holding the lease
+            lease_seconds: New lease duration from now
+
+        Returns:
+            False if the lease was lost (taken over after expiring)
+        """
+        with session_scope() as session:
+            return bool(
+                session.execute(
+                    update(GenerationJobEntity)
+                    .where(GenerationJobEntity.id == job_id)
+                    .where(GenerationJobEntity.lease_owner == owner)
+                    .where(GenerationJobEntity.status == JOB_LEASED)
+                    .values(lease_expires_at=_utcnow() + timedelta(seconds=lease_seconds))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+            )
+
+    @staticmethod
+    def complete(
+        job_id: str, owner: str, entities: List[TimeLockPuzzleEntity | RSAEntity]
+    ) -> bool:
+        """
+        Save a job's puzzles and mark it done in one transaction, if the lease is still held.
+
+        Args:
+            job_id: ID of the leased job
+            owner: Worker holding the lease
+            entities: The chunk's RSA and puzzle entities
+
+        Returns:
+            False if the lease was lost; nothing is saved in that case
+        """
+        check_persistable(entities)
+        with session_scope() as session:
+            completed = session.execute(
+                update(GenerationJobEntity)
+                .where(GenerationJobEntity.id == job_id)
+                .where(GenerationJobEntity.lease_owner == owner)
+                .where(GenerationJobEntity.status == JOB_LEASED)
+                .values(status=JOB_DONE, completed_at=_utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not completed:
+                return False
+            session.add_all(entities)
+        return True
+
+    @staticmethod
+    def progress(batch_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count puzzles per job status.
+
+        Args:
+            batch_id: Restrict to one batch (all batches if None)
+
+        Returns:
+            Map of status -> number of puzzles in jobs with that status
+        """
+        query = select(GenerationJobEntity.status, func.sum(GenerationJobEntity.amount)).group_by(
+            GenerationJobEntity.status
+        )
+        if batch_id is not None:
+            query = query.where(GenerationJobEntity.batch_id == batch_id)
+        with session_scope() as session:
+            counts = dict(session.execute(query).all())
+        return {
+            status: int(counts.get(status) or 0) for status in (JOB_PENDING, JOB_LEASED, JOB_DONE)
+        }
+
+
+class LeaseHeartbeat(threading.Thread):
+    """Background thread that keeps a job lease alive while the chunk is being generated."""
+
+    def __init__(self, job_id: str, owner: str, lease_seconds: float) -> None:
+        """Initialize the heartbeat.
+
+        Args:
+            job_id (str): ID of the leased job
+            owner (str): Worker holding the lease
+            lease_seconds (float): Lease duration; it is renewed every third of it
+        """
+        super().__init__(daemon=True)
+        self._job_id = job_id
+        self._owner = owner
+        self._lease_seconds = lease_seconds
+        self._stopped = threading.Event()
+        self.lost = False  # Set once a renewal finds the lease taken over
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._lease_seconds / 3):
+            try:
+                renewed = GenerationJobService.heartbeat(
+                    self._job_id, self._owner, self._lease_seconds
+                )
+                if not renewed:
+                    self.lost = True
+                    return
+            except Exception as e:  # pylint: disable=broad-except
+                # A transient database error must not kill the heartbeat; the next beat retries
+                print(f"Lease heartbeat for job {self._job_id} failed: {e}")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
@@ -0,0 +1,129 @@
+"""Read-side helper that derives puzzle outputs on demand in lazy output mode."""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import case, select, update
+
+from src.database.database import session_scope
+from src.database.entity.RSAEntity import RSAEntity
+from src.database.entity.TimeLockPuzzleEntity import LAZY_REQUEST_PREFIX, TimeLockPuzzleEntity
+from src.mpc import MPC
+from src.time_lock_puzzle.EfficientTimeLockPuzzleSolver import EfficientTimeLockPuzzleSolver
+from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
+
+
+class LazyOutputResolver:
+    """Returns the output y of a stored puzzle, deriving it from p and q when it was not stored.
+
+    Puzzles generated in lazy output mode have no y. The first read derives it through the
+    trapdoor (`EfficientTimeLockPuzzleSolver.solve_with_factors`) and keeps it in a bounded LRU
+    cache keyed by puzzle id; with `write_back` it is also stored on the row, so later readers
+    (including the orchestrator) find it there, and a puzzle held out of the pool for lack of y
+    (request_id `lazy:<id>`) is released into it.
+    """
+
+    def __init__(self, cache_size: int = 1024, write_back: bool = False) -> None:
+        """Initialize the resolver.
+
+        Args:
+            cache_size (int): Maximum number of outputs kept in memory
+            write_back (bool): Whether derived outputs are also saved to the puzzle row
+        """
+        self._cache_size = cache_size
+        self._write_back = write_back
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_output(self, puzzle_id: str) -> Optional[str]:
+        """Get the output of a puzzle.
+
+        Args:
+            puzzle_id (str): ID of the time lock puzzle
+
+        Returns:
+            Optional[str]: Hex string of y, or None if there is no such puzzle
+        """
+        with self._lock:
+            if puzzle_id in self._cache:
+                self._cache.move_to_end(puzzle_id)
+                return self._cache[puzzle_id]
+
+        with session_scope() as session:
+            row = session.execute(
+                select(
+                    TimeLockPuzzleEntity.x,
+                    TimeLockPuzzleEntity.y,
+                    TimeLockPuzzleEntity.t,
+                    TimeLockPuzzleEntity.modulus,
+                    RSAEntity.p,
+                    RSAEntity.q,
+                )
+                .join(RSAEntity, TimeLockPuzzleEntity.rsa_id == RSAEntity.id)
+                .where(TimeLockPuzzleEntity.id == puzzle_id)
+            ).one_or_none()
+            if row is None:
+                return None
+
+            x_hex, y_hex, t, N_hex, p_hex, q_hex = row
+            if y_hex is None:
+                puzzle = TimeLockPuzzle(
+                    MPC.mpz(int(x_hex, 16)), MPC.mpz(int(t)), MPC.mpz(int(N_hex, 16))
+                )
+                y = EfficientTimeLockPuzzleSolver.solve_with_factors(
+                    MPC.mpz(int(p_hex, 16)), MPC.mpz(int(q_hex, 16)), puzzle
+                )
+                y_hex = hex(y)[2:]  # remove 0x
+                if self._write_back:
+                    session.execute(
+                        update(TimeLockPuzzleEntity)
+                        .where(TimeLockPuzzleEntity.id == puzzle_id)
+                        .where(TimeLockPuzzleEntity.y.is_(None))
+                        .values(
+                            y=y_hex,
+                            request_id=case(
+                                (
+                                    TimeLockPuzzleEntity.request_id
+                                    == f"{LAZY_REQUEST_PREFIX}{puzzle_id}",
+                                    None,
+                                ),
+                                else_=TimeLockPuzzleEntity.request_id,
+                            ),
+                        )
+                    )
+
+        with self._lock:
+            self._cache[puzzle_id] = y_hex
+            self._cache.move_to_end(puzzle_id)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return y_hex
+
+    def release_held(self, batch_size: int = 100) -> int:
+        """Write back y for every puzzle stored without it; held puzzles join the pool.
+
+        Args:
+            batch_size (int): Puzzles read per query
+
+        Returns:
+            int: Number of puzzles given their y
+        """
+        writer = LazyOutputResolver(cache_size=0, write_back=True)  # Whatever this one does
+        released = 0
+        while True:
+            with session_scope() as session:
+                puzzle_ids = (
+                    session.execute(
+                        select(TimeLockPuzzleEntity.id)
+                        .where(TimeLockPuzzleEntity.y.is_(None))
+                        .limit(batch_size)
+                    )
+                    .scalars()
+                    .all()
+                )
+            if not puzzle_ids:
+                return released
+            for puzzle_id in puzzle_ids:
+                writer.get_output(puzzle_id)
+            released += len(puzzle_ids)
@@ -0,0 +1,148 @@
+"""Fans entity batches out to several writer connections that commit independently."""
+
+import multiprocessing
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Session
+
+from .database import check_persistable, get_engine
+from .entity.RSAEntity import RSAEntity
+from .entity.TimeLockPuzzleEntity import TimeLockPuzzleEntity
+
+# Spawned (not forked) writers: the parent may hold open connections and threads
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+@dataclass
+class WriterStats:
+    """Throughput and commit latency of one writer."""
+
+    writer: int
+    rows: int = 0
+    commits: int = 0
+    seconds: float = 0.0  # Wall time from the writer's first to its last commit
+    commit_latencies: List[float] = field(default_factory=list)  # Seconds per transaction
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Commit latency (seconds) at a percentile between 0 and 100."""
+        return latency_percentile(self.commit_latencies, percentile)
+
+
+def latency_percentile(latencies: List[float], percentile: float) -> float:
+    """Latency at a percentile between 0 and 100 of unordered samples (0.0 if there are none)."""
+    if not latencies:
+        return 0.0
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+
+class PartitionedWriter:
+    """Saves entities over `writers` connections, each in its own process.
+
+    Entities are partitioned by a stable hash of their rsa_id, so an RSA key and its puzzle always
+    go to the same writer, key first. Each writer commits its partition in batches of up to
+    `batch_size` entities on its own connection, independently of the others. Batches are cut
+    between pairs, so a key is always committed together with its puzzle. A failed batch is
+    rolled back alone; its writer stops there, and the first failure is raised once every writer
+    has finished.
+
+    Processes rather than threads, because building the INSERTs is CPU bound under the GIL. On
+    SQLite writers still serialize on the database lock; the stats make that visible.
+    """
+
+    def __init__(self, writers: int, batch_size: int = 500) -> None:
+        """Initialize the writer stage.
+
+        Args:
+            writers (int): Number of writer connections (K)
+            batch_size (int): Entities per transaction (at least one key and its puzzle)
+        """
+        if writers < 1:
+            raise ValueError("writers must be at least 1")
+        self._writers = writers
+        self._batch_size = batch_size
+
+    def write(self, entities: List[TimeLockPuzzleEntity | RSAEntity]) -> List[WriterStats]:
+        """Save entities, returning the stats of each writer.
+
+        Args:
+            entities (List[TimeLockPuzzleEntity | RSAEntity]): Entities to save; each RSA key must
+                come before its puzzle, as convert_to_entities produces them
+
+        Returns:
+            List[WriterStats]: One entry per writer, in writer order
+        """
+        check_persistable(entities)
+        # Per writer, the entities of each RSA key (the key and its puzzle), in order
+        partitions: List[Dict[str, List[TimeLockPuzzleEntity | RSAEntity]]] = [
+            {} for _ in range(self._writers)
+        ]
+        for entity in entities:
+            rsa_id = entity.id if isinstance(entity, RSAEntity) else entity.rsa_id
+            partition = partitions[zlib.crc32(rsa_id.encode()) % self._writers]
+            partition.setdefault(rsa_id, []).append(entity)
+
+        url = get_engine().url.render_as_string(hide_password=False)
+        with ProcessPoolExecutor(self._writers, mp_context=_MP_CONTEXT) as executor:
+            futures = [
+                executor.submit(
+                    _write_partition, url, index, list(partition.values()), self._batch_size
+                )
+                for index, partition in enumerate(partitions)
+            ]
+            results = [future.exception() or future.result() for future in futures]
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+
+def _batches(
+    groups: List[List[TimeLockPuzzleEntity | RSAEntity]], batch_size: int
+) -> Iterator[List[TimeLockPuzzleEntity | RSAEntity]]:
+    """Packs whole groups into batches of up to batch_size entities (one group if larger)."""
+    batch: List[TimeLockPuzzleEntity | RSAEntity] = []
+    for group in groups:
+        if batch and len(batch) + len(group) > batch_size:
+            yield batch
+            batch = []
+        batch.extend(group)
+    if batch:
+        yield batch
+
+
+def _write_partition(
+    url: str,
+    index: int,
+    partition: List[List[TimeLockPuzzleEntity | RSAEntity]],
+    batch_size: int,
+) -> WriterStats:
+    """Writer process body: commits one partition in batches over its own connection."""
+    stats = WriterStats(writer=index)
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            began = time.perf_counter()
+            for batch in _batches(partition, batch_size):
+                batch_start = time.perf_counter()
+                with Session(bind=connection, expire_on_commit=False) as session:
+                    session.add_all(batch)
+                    session.commit()
+                stats.commit_latencies.append(time.perf_counter() - batch_start)
+                stats.rows += len(batch)
+                stats.commits += 1
+            stats.seconds = time.perf_counter() - began
+    finally:
+        engine.dispose()
+    return stats
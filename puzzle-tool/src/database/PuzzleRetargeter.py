@@ -0,0 +1,217 @@
+"""Moves the unassigned puzzle pool to a new timing parameter through the RSA trapdoor."""
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine, create_engine, select, text
+
+from src.mpc import MPC
+from src.protocol_constants import BIT_SIZE
+from src.random import Random
+from src.time_lock_puzzle.EfficientTimeLockPuzzleSolver import EfficientTimeLockPuzzleSolver
+from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
+from src.database.database import check_persistable, get_engine, session_scope
+from src.database.entity.RSAEntity import RSAEntity
+from src.database.entity.TimeLockPuzzleEntity import TimeLockPuzzleEntity
+
+# Spawned (not forked) workers: the parent holds an open engine
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Only rows nobody has claimed yet; a puzzle claimed mid-run keeps the values it was issued with
+_UPDATE_PUZZLE = text(
+    "UPDATE time_lock_puzzles SET x = :x, y = :y, t = :t WHERE id = :id AND request_id IS NULL"
+)
+
+# (id, x hex, whether y is stored, N hex, p hex, q hex)
+Row = Tuple[str, str, bool, str, str, str]
+
+# Engine of a worker process, created once by _connect_worker
+_worker_engine: Optional[Engine] = None
+
+
+@dataclass
+class RetargetReport:
+    """Outcome of a retarget run."""
+
+    t: int
+    puzzles: int = 0  # Puzzles moved to t
+    lazy: int = 0  # Puzzles read without y; only t (and x) is rewritten, y is derived on read
+    skipped: int = 0  # Claimed between being read and being updated, left as they were
+    failed: int = 0  # In batches that failed; left as they were, for the next run to pick up
+    batches: int = 0
+    failed_batches: int = 0
+    math_seconds: float = 0.0  # Trapdoor computation summed over workers
+    commit_seconds: List[float] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        lines = [
+            f"Retargeted {self.puzzles} unassigned puzzles ({self.lazy} lazy) to t={self.t} "
+            f"in {self.batches} batch(es); {self.skipped} claimed meanwhile and skipped",
+            f"Trapdoor time: {self.math_seconds:.2f} seconds over all workers",
+        ]
+        if self.failed_batches:
+            lines.append(
+                f"{self.failed} puzzles in {self.failed_batches} failed batch(es) were left as "
+                "they were; run again to retarget them"
+            )
+        if self.commit_seconds:
+            lines.append(
+                f"Batch transaction time: max {max(self.commit_seconds) * 1000:.1f} ms, "
+                f"avg {sum(self.commit_seconds) / len(self.commit_seconds) * 1000:.1f} ms"
+            )
+        lines.append(f"Total time: {self.elapsed_seconds:.2f} seconds")
+        return "\n".join(lines)
+
+
+class PuzzleRetargeter:
+    """Rewrites unassigned puzzles for a new t, reusing their RSA keys.
+
+    The pool is read in id order, a batch at a time, joined with the RSA keys. Worker processes
+    recompute y = x^(2^t) mod N from p and q (EfficientTimeLockPuzzleSolver.solve_with_factors,
+    a couple of half-size modular exponentiations per puzzle, whatever t is) and update their
+    batch in one transaction each. Rows already at t are not read, so an interrupted run resumes
+    where it stopped. A failed batch is rolled back alone and counted in the report; the run
+    carries on with the next ones. Puzzles stored without y (lazy output mode) keep it unset.
+    """
+
+    def __init__(self, workers: int, batch_size: int = 500, redraw_x: bool = False) -> None:
+        """Initialize the retargeter.
+
+        Args:
+            workers (int): Number of worker processes, each with its own connection
+            batch_size (int): Puzzles per read and per update transaction
+            redraw_x (bool): Also draw a fresh x for every puzzle
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._workers = workers
+        self._batch_size = batch_size
+        self._redraw_x = redraw_x
+
+    def retarget(self, t: int) -> RetargetReport:
+        """Move every unassigned puzzle to timing parameter t.
+
+        Args:
+            t (int): New number of squarings
+
+        Returns:
+            RetargetReport: What was updated
+        """
+        if t < 1:
+            raise ValueError("t must be positive")
+        if self._redraw_x:
+            check_persistable()  # New inputs come from Random
+        report = RetargetReport(t=t)
+        start_time = time.time()
+
+        url = get_engine().url.render_as_string(hide_password=False)
+        with ProcessPoolExecutor(
+            self._workers,
+            mp_context=_MP_CONTEXT,
+            initializer=_connect_worker,
+            initargs=(url,),
+        ) as executor:
+            pending: Dict[Future, int] = {}  # Batch future -> puzzles in the batch
+            last_id = None
+            while True:
+                rows = self._read_batch(str(t), last_id)
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                pending[executor.submit(_retarget_batch, rows, t, self._redraw_x)] = len(rows)
+                if len(pending) >= 2 * self._workers:  # Read ahead, but only a little
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _add_batch(report, future, pending.pop(future))
+            for future in wait(pending).done:
+                _add_batch(report, future, pending[future])
+
+        report.elapsed_seconds = time.time() - start_time
+        return report
+
+    def _read_batch(self, t: str, last_id: Optional[str]) -> List[Row]:
+        """Reads the next batch of unassigned puzzles not yet at t, with their factors."""
+        query = (
+            select(
+                TimeLockPuzzleEntity.id,
+                TimeLockPuzzleEntity.x,
+                TimeLockPuzzleEntity.y,
+                TimeLockPuzzleEntity.modulus,
+                RSAEntity.p,
+                RSAEntity.q,
+            )
+            .join(RSAEntity, TimeLockPuzzleEntity.rsa_id == RSAEntity.id)
+            .where(TimeLockPuzzleEntity.request_id.is_(None))
+            .where(TimeLockPuzzleEntity.t != t)
+            .order_by(TimeLockPuzzleEntity.id)
+            .limit(self._batch_size)
+        )
+        if last_id is not None:
+            query = query.where(TimeLockPuzzleEntity.id > last_id)
+        with session_scope() as session:
+            return [
+                (puzzle_id, x_hex, y_hex is not None, N_hex, p_hex, q_hex)
+                for puzzle_id, x_hex, y_hex, N_hex, p_hex, q_hex in session.execute(query)
+            ]
+
+
+def _add_batch(report: RetargetReport, future: Future, rows: int) -> None:
+    try:
+        updated, lazy, skipped, math_seconds, commit_seconds = future.result()
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"Retargeting a batch of {rows} puzzles failed, leaving it as it was: {e}")
+        report.failed += rows
+        report.failed_batches += 1
+        return
+    report.puzzles += updated
+    report.lazy += lazy
+    report.skipped += skipped
+    report.batches += 1
+    report.math_seconds += math_seconds
+    report.commit_seconds.append(commit_seconds)
+
+
+def _connect_worker(url: str) -> None:
+    """Worker process initializer: one engine per process, reused for every batch."""
+    global _worker_engine
+    _worker_engine = create_engine(url)
+
+
+def _retarget_batch(
+    rows: List[Row], t: int, redraw_x: bool
+) -> Tuple[int, int, int, float, float]:
+    """
+    Worker process body: recomputes one batch and updates it in a single transaction.
+
+    :return: (puzzles updated, puzzles without y, puzzles skipped, trapdoor seconds,
+        commit seconds)
+    """
+    math_start = time.process_time()
+    new_t = MPC.mpz(t)
+    params = []
+    lazy = 0
+    for puzzle_id, x_hex, has_y, N_hex, p_hex, q_hex in rows:
+        if redraw_x:
+            x = MPC.mpz_urandomb(Random.get_random(BIT_SIZE), BIT_SIZE)
+            x_hex = hex(x)[2:]  # remove 0x
+        y_hex = None
+        if has_y:
+            puzzle = TimeLockPuzzle(MPC.mpz(int(x_hex, 16)), new_t, MPC.mpz(int(N_hex, 16)))
+            y = EfficientTimeLockPuzzleSolver.solve_with_factors(
+                MPC.mpz(int(p_hex, 16)), MPC.mpz(int(q_hex, 16)), puzzle
+            )
+            y_hex = hex(y)[2:]  # remove 0x
+        else:
+            lazy += 1
+        params.append({"id": puzzle_id, "x": x_hex, "y": y_hex, "t": str(t)})
+    math_seconds = time.process_time() - math_start
+
+    commit_start = time.perf_counter()
+    with _worker_engine.begin() as connection:
+        updated = connection.execute(_UPDATE_PUZZLE, params).rowcount
+    commit_seconds = time.perf_counter() - commit_start
+    return updated, lazy, len(rows) - updated, math_seconds, commit_seconds
@@ -0,0 +1,121 @@
+# src/database/benchmark_writers.py
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+from sqlalchemy import delete
+
+# Dynamically add the `src` directory to `sys.path`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from src.database.entity import RSAEntity, TimeLockPuzzleEntity
+
+from src.database.database import session_scope
+from src.database.DatabaseService import DatabaseService
+from src.protocol_constants import BIT_SIZE, TIMING_PARAMETER
+
+_DELETE_CHUNK = 500
+
+
+def synthetic_entities(count: int) -> List[TimeLockPuzzleEntity | RSAEntity]:
+    """
+    Build RSA/puzzle entity pairs with random values of realistic size (not valid puzzles).
+
+    Args:
+        count: Number of puzzles
+
+    Returns:
+        Entities in the order convert_to_entities produces them
+    """
+    half_bytes = BIT_SIZE // 16
+    entities = []
+    for _ in range(count):
+        p, q = os.urandom(half_bytes).hex(), os.urandom(half_bytes).hex()
+        N, phi = os.urandom(2 * half_bytes).hex(), os.urandom(2 * half_bytes).hex()
+        rsa_entity = RSAEntity(p, q, N, phi)
+        x, y = os.urandom(2 * half_bytes).hex(), os.urandom(2 * half_bytes).hex()
+        puzzle_entity = TimeLockPuzzleEntity(
+            x, y, str(TIMING_PARAMETER), N, rsa_entity.id, rsa_entity.created_at
+        )
+        entities.extend([rsa_entity, puzzle_entity])
+    return entities
+
+
+def remove_entities(entities: List[TimeLockPuzzleEntity | RSAEntity]) -> None:
+    """
+    Delete the benchmark's rows again, puzzles before their RSA keys.
+
+    Args:
+        entities: Entities written by the benchmark
+    """
+    rsa_ids = [entity.id for entity in entities if isinstance(entity, RSAEntity)]
+    for start in range(0, len(rsa_ids), _DELETE_CHUNK):
+        chunk = rsa_ids[start : start + _DELETE_CHUNK]
+        with session_scope() as session:
+            session.execute(
+                delete(TimeLockPuzzleEntity).where(TimeLockPuzzleEntity.rsa_id.in_(chunk))
+            )
+            session.execute(delete(RSAEntity).where(RSAEntity.id.in_(chunk)))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure save throughput for several writer counts against a stand-in "
+        "database. Writes synthetic puzzles and deletes them after each run."
+    )
+    parser.add_argument(
+        "--puzzles", type=int, default=20000, help="Synthetic puzzles written per run"
+    )
+    parser.add_argument(
+        "--writers",
+        type=str,
+        default="1,2,4,8",
+        help="Comma-separated writer counts to try",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Entities per writer transaction"
+    )
+    parser.add_argument(
+        "--stand-in",
+        action="store_true",
+        help="Confirm the configured database is a stand-in; the synthetic puzzles are briefly "
+        "claimable",
+    )
+    args = parser.parse_args()
+    if not args.stand_in:
+        parser.error("point DATABASE_* at a stand-in database and pass --stand-in")
+    return args
+
+
+def main() -> None:
+    """Write synthetic puzzles with each writer count and report throughput and latency."""
+    args = parse_args()
+    for writers in [int(k) for k in args.writers.split(",")]:
+        entities = synthetic_entities(args.puzzles)
+        start_time = time.time()
+        try:
+            writer_stats = DatabaseService.save_partitioned(entities, writers, args.batch_size)
+            total_time = time.time() - start_time
+        finally:
+            remove_entities(entities)
+
+        latencies = sorted(
+            latency for stats in writer_stats for latency in stats.commit_latencies
+        )
+        print(
+            f"K={writers}: {len(entities) / total_time:,.0f} rows/s overall, commit p50 "
+            f"{latencies[len(latencies) // 2] * 1000:.1f} ms, "
+            f"p99 {latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1000:.1f} ms"
+        )
+        for stats in writer_stats:
+            print(
+                f"  Writer {stats.writer}: {stats.rows} rows in {stats.commits} commits, "
+                f"{stats.rows_per_second:,.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
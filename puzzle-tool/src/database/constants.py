@@ -18,3 +18,14 @@ else:
     DATABASE_URL = (
         f"postgresql+psycopg2://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
     )
+
+# Optional PostgreSQL range partitioning of rsa_keys and time_lock_puzzles by creation time, so
+# retention can drop whole partitions (see src/database/partitions.py). Ignored for SQLite.
+DATABASE_PARTITIONING = os.getenv("DATABASE_PARTITIONING", "false").lower() in ("1", "true", "yes")
+PARTITION_INTERVAL_HOURS = int(os.getenv("PARTITION_INTERVAL_HOURS", "24"))
+PARTITIONS_AHEAD = int(os.getenv("PARTITIONS_AHEAD", "3"))  # Upcoming partitions kept created
+PARTITIONED = DATABASE_PARTITIONING and DATABASE_TYPE == "postgresql"
+
+# Opt-in lazy output mode (generate.py --lazy-output): puzzles may be stored without y, which
+# relaxes NOT NULL on time_lock_puzzles.y. Leave it off unless lazily generated pools are used.
+LAZY_OUTPUT = os.getenv("LAZY_OUTPUT", "false").lower() in ("1", "true", "yes")
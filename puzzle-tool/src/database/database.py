@@ -1,7 +1,11 @@
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List
+
 from sqlalchemy import create_engine, Engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
 from src.database.constants import DATABASE_URL
+from src.random.Random import Random
 
 # Global variable to hold the singleton engine
 _engine = None
@@ -20,6 +24,59 @@ def get_engine() -> Engine:
     return _engine
 
 
+def is_postgresql() -> bool:
+    """
+    Whether the configured engine talks to PostgreSQL (as opposed to the SQLite fallback).
+
+    :return: True for PostgreSQL engines.
+    :rtype: bool
+    """
+    return get_engine().dialect.name == "postgresql"
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Provide a session wrapped in a single transaction.
+
+    Commits when the block exits normally, rolls back if it raises, and always closes the session.
+
+    :return: SQLAlchemy Session bound to the singleton engine.
+    :rtype: sqlalchemy.orm.Session
+    """
+    # Keep loaded attributes after commit so saved entities stay readable once the session closes
+    session = sessionmaker(bind=get_engine(), expire_on_commit=False)()
+
+    try:
+        yield session
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+
+def check_persistable(instances: Iterable[Any] = ()) -> None:
+    """
+    Refuses to save anything while insecure benchmark mode is enabled in this process, and any
+    instance generated in that mode (see Saveable.insecure_benchmark) at any time.
+
+    Puzzles generated from a known seed can be solved by anyone and must never reach the pool.
+
+    :param instances: The ORM model instances about to be saved or updated.
+    :raises RuntimeError: If insecure benchmark mode is enabled or an instance comes from it.
+    """
+    if Random.get_insecure_seed() is not None:
+        raise RuntimeError(
+            "Refusing to save: insecure benchmark mode is enabled and its puzzles are predictable"
+        )
+    if any(getattr(instance, "insecure_benchmark", False) for instance in instances):
+        raise RuntimeError(
+            "Refusing to save: generated in insecure benchmark mode, so it is predictable"
+        )
+
+
 Base = declarative_base()  # Single instance of Base
 
 
@@ -33,6 +90,7 @@ def save_instance(instance: any) -> None:
 
     :param instance: The ORM model instance to save.
     """
+    check_persistable([instance])
     engine = get_engine()
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -47,12 +105,24 @@ def save_instance(instance: any) -> None:
         session.close()
 
 
+def save_instances(instances: List[any]) -> None:
+    """
+    Save several instances of ORM models to the database in a single transaction.
+
+    :param instances: The ORM model instances to save.
+    """
+    check_persistable(instances)
+    with session_scope() as session:
+        session.add_all(instances)
+
+
 def update_instance(instance: any) -> None:
     """
     Update an instance of an ORM model in the database.
 
     :param instance: The ORM model instance to update.
     """
+    check_persistable([instance])
     engine = get_engine()
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -0,0 +1,50 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from src.database.mixins.saveable import Saveable
+from src.database.database import get_orm_base
+
+# Define the Base class for ORM models
+Base = get_orm_base()
+
+JOB_PENDING = "pending"
+JOB_LEASED = "leased"
+JOB_DONE = "done"
+
+
+class GenerationJobEntity(Base, Saveable):
+    """Database entity for one chunk of a distributed puzzle generation target."""
+
+    __tablename__ = "generation_jobs"
+    __table_args__ = (Index("ix_generation_jobs_status_lease", "status", "lease_expires_at"),)
+
+    id = Column(String, primary_key=True)  # Unique generated string ID
+    batch_id = Column(String, nullable=False, index=True)  # Groups the chunks of one target count
+    amount = Column(Integer, nullable=False)  # Number of puzzles this chunk produces
+    status = Column(String, nullable=False)  # pending -> leased -> done
+    lease_owner = Column(String, nullable=True)  # Worker currently holding the lease
+    lease_expires_at = Column(DateTime, nullable=True)  # Lease may be taken over after this
+    attempts = Column(Integer, nullable=False)  # Number of times the chunk was leased
+    created_at = Column(DateTime, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<GenerationJob(id={self.id}, amount={self.amount}, status={self.status}, "
+            f"owner={self.lease_owner})>"
+        )
+
+    def __init__(self, batch_id: str, amount: int):
+        """Initialize a pending generation job.
+
+        Args:
+            batch_id (str): ID shared by all chunks of one target count
+            amount (int): Number of puzzles this chunk produces
+        """
+        self.id = str(uuid.uuid4())  # Generate ID on creation
+        self.batch_id = batch_id
+        self.amount = amount
+        self.status = JOB_PENDING
+        self.attempts = 0
+        self.created_at = datetime.now(timezone.utc).replace(tzinfo=None)
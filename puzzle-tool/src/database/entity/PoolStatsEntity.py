@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, Integer
+
+from src.database.database import get_orm_base
+
+# Define the Base class for ORM models
+Base = get_orm_base()
+
+
+class PoolStatsEntity(Base):
+    """Database entity for one slot of the puzzle pool counters.
+
+    The counters are maintained by database triggers on time_lock_puzzles (see
+    src/database/pool_stats.py). They are striped over a few slots so that concurrent writers do
+    not all wait on one row; the pool totals are the sums over all slots.
+    """
+
+    __tablename__ = "pool_stats"
+
+    slot = Column(Integer, primary_key=True, autoincrement=False)
+    total = Column(BigInteger, nullable=False)  # Puzzles in time_lock_puzzles
+    unassigned = Column(BigInteger, nullable=False)  # Puzzles with no request_id yet
+
+    def __repr__(self):
+        return f"<PoolStats(slot={self.slot}, total={self.total}, unassigned={self.unassigned})>"
@@ -1,10 +1,13 @@
 import uuid
-from sqlalchemy import Column, String
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import Column, DateTime, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
 from src.database.mixins.saveable import Saveable
 from src.database.database import get_orm_base
+from src.database.constants import PARTITIONED
 
 # Define the Base class for ORM models
 Base = get_orm_base()
@@ -14,20 +17,38 @@ class RSAEntity(Base, Saveable):
     """Database entity for storing RSA parameters."""
 
     __tablename__ = "rsa_keys"
+    if PARTITIONED:
+        # Range partitions by creation time; the partition key joins the primary key
+        __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id = Column(String, primary_key=True)  # Unique generated string ID
     p = Column(String, nullable=False)  # Store hex string of prime p
     q = Column(String, nullable=False)  # Store hex string of prime q
     modulus = Column(String, nullable=False)  # Store hex string of modulus N
     phi = Column(String, nullable=False)  # Store hex string of Euler's totient
+    if PARTITIONED:
+        # Only mapped when partitioned: the orchestrator creates the tables without this column
+        created_at = Column(
+            DateTime, primary_key=True
+        )  # Shared with the key's puzzle, so both land in partitions with the same bounds
     puzzle = relationship(
         "TimeLockPuzzleEntity", back_populates="rsa", uselist=False
     )  # One-to-one back reference to puzzle
 
+    if PARTITIONED:
+        __mapper_args__ = {"primary_key": [id]}  # Rows are still identified by id alone
+
     def __repr__(self):
         return f"<RSA(id={self.id}, N={self.N})>"
 
-    def __init__(self, p_hex: str, q_hex: str, N_hex: str, phi_hex: str):
+    def __init__(
+        self,
+        p_hex: str,
+        q_hex: str,
+        N_hex: str,
+        phi_hex: str,
+        created_at: Optional[datetime] = None,
+    ):
         """Initialize an RSA entity.
 
         Args:
@@ -35,9 +56,12 @@ class RSAEntity(Base, Saveable):
             q_hex (str): Hex string of prime q
             N_hex (str): Hex string of modulus N
             phi_hex (str): Hex string of Euler's totient
+            created_at (Optional[datetime]): Naive UTC creation time (now if None); only stored
+                when the tables are partitioned
         """
         self.id = str(uuid.uuid4())  # Generate ID on creation
         self.p = p_hex
         self.q = q_hex
         self.modulus = N_hex
         self.phi = phi_hex
+        self.created_at = created_at or datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,49 +1,128 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    String,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from src.database.mixins.saveable import Saveable
 from src.database.database import get_orm_base
+from src.database.constants import LAZY_OUTPUT, PARTITIONED
 
 # Define the Base class for ORM models
 Base = get_orm_base()
 
+# request_id held by puzzles stored without y: the orchestrator reads y directly, so they stay out
+# of the unassigned pool until LazyOutputResolver writes y back and releases them
+LAZY_REQUEST_PREFIX = "lazy:"
+
 
 class TimeLockPuzzleEntity(Base, Saveable):
     """Database entity for storing time lock puzzles."""
 
     __tablename__ = "time_lock_puzzles"
+    __table_args__ = (
+        # Partial index over the unassigned pool: serves the orchestrator's
+        # `COUNT(*) ... WHERE request_id IS NULL` and the ordered claim scan.
+        Index(
+            "ix_time_lock_puzzles_unassigned",
+            "id",
+            postgresql_where=text("request_id IS NULL"),
+            sqlite_where=text("request_id IS NULL"),
+        ),
+        # At most one puzzle per request, whoever assigns it. A unique index on a partitioned
+        # table must include the partition key, which would not enforce that, so there it is a
+        # plain index and only claim()'s locking keeps request ids apart.
+        Index(
+            "ix_time_lock_puzzles_request_id",
+            "request_id",
+            unique=not PARTITIONED,
+            postgresql_where=text("request_id IS NOT NULL"),
+            sqlite_where=text("request_id IS NOT NULL"),
+        ),
+        Index("ix_time_lock_puzzles_detected_completed", "detected_completed"),
+    )
+    if PARTITIONED:
+        # Range partitions by creation time. Unique and foreign keys must include the partition
+        # key, so a puzzle references its RSA key by (id, created_at).
+        __table_args__ += (
+            UniqueConstraint("rsa_id", "created_at"),
+            ForeignKeyConstraint(
+                ["rsa_id", "created_at"],
+                ["rsa_keys.id", "rsa_keys.created_at"],
+                ondelete="CASCADE",
+            ),
+            {"postgresql_partition_by": "RANGE (created_at)"},
+        )
 
     id = Column(
         String, primary_key=True, default=lambda: str(uuid.uuid4())
     )  # Unique generated string ID
     x = Column(String, nullable=False)  # Store hex string of input value x
-    y = Column(String, nullable=False)  # Store hex string of y value
+    y = Column(
+        String, nullable=LAZY_OUTPUT
+    )  # Store hex string of y value (NULL in lazy output mode, see LazyOutputResolver)
     t = Column(String, nullable=False)  # Store base 10 string of time parameter t
     modulus = Column(String, nullable=False)  # Store hex string of modulus N
     request_id = Column(
         String, nullable=True
     )  # Optional associated randomness request id (will be filled within the provider node runtime)
-    rsa_id = Column(
-        String, ForeignKey("rsa_keys.id"), nullable=False, unique=True
-    )  # One-to-one reference to RSA key
+    detected_completed = Column(
+        DateTime, nullable=True
+    )  # Set by the provider node once the request no longer needs this puzzle
+    if PARTITIONED:
+        rsa_id = Column(String, nullable=False)  # One-to-one reference to RSA key
+    else:
+        rsa_id = Column(
+            String, ForeignKey("rsa_keys.id", ondelete="CASCADE"), nullable=False, unique=True
+        )  # One-to-one reference to RSA key (the orchestrator deletes keys, relying on the cascade)
+    if PARTITIONED:
+        # Only mapped when partitioned: the orchestrator creates the tables without this column
+        created_at = Column(DateTime, primary_key=True)  # Same as the RSA key's; the partition key
     rsa = relationship(
         "RSAEntity", back_populates="puzzle"
     )  # One-to-one relationship to RSA entity
 
+    if PARTITIONED:
+        __mapper_args__ = {"primary_key": [id]}  # Rows are still identified by id alone
+
     def __repr__(self):
         return f"<TimeLockPuzzle(id={self.id}, x={self.x}, t={self.t}, N={self.N})>"
 
-    def __init__(self, x_hex: str, y_hex: str, t: str, N_hex: str, rsa_id: str):
+    def __init__(
+        self,
+        x_hex: str,
+        y_hex: Optional[str],
+        t: str,
+        N_hex: str,
+        rsa_id: str,
+        created_at: Optional[datetime] = None,
+    ):
         """Initialize a time lock puzzle entity.
 
         Args:
             x_hex (str): Hex string of input value x
+            y_hex (Optional[str]): Hex string of y value, or None to derive it lazily (the
+                puzzle is then held out of the pool, see LAZY_REQUEST_PREFIX)
             t (str): Base 10 string of time parameter t
             N_hex (str): Hex string of modulus N
+            created_at (Optional[datetime]): Naive UTC creation time; pass the RSA key's
+                (now if None). Only stored when the tables are partitioned
         """
+        self.id = str(uuid.uuid4())  # Generate ID on creation so it can be handed out before saving
         self.x = x_hex
         self.y = y_hex
         self.t = t
         self.modulus = N_hex
         self.rsa_id = rsa_id
+        self.created_at = created_at or datetime.now(timezone.utc).replace(tzinfo=None)
+        if y_hex is None:
+            self.request_id = f"{LAZY_REQUEST_PREFIX}{self.id}"
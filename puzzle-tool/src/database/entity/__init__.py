@@ -2,5 +2,7 @@
 
 from .TimeLockPuzzleEntity import TimeLockPuzzleEntity
 from .RSAEntity import RSAEntity
+from .GenerationJobEntity import GenerationJobEntity
+from .PoolStatsEntity import PoolStatsEntity
 
-__all__ = ["TimeLockPuzzleEntity", "RSAEntity"]
+__all__ = ["TimeLockPuzzleEntity", "RSAEntity", "GenerationJobEntity", "PoolStatsEntity"]
@@ -2,13 +2,127 @@
 
 import os
 import sys
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import Engine, inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError
 
 # Dynamically add the `src` directory to `sys.path`
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 from src.database.entity import *
 
 from src.database.database import get_engine, Base
+from src.database.constants import LAZY_OUTPUT, PARTITIONED
+from src.database.partitions import PARTITIONED_TABLES, ensure_partitions, is_partitioned
+from src.database.pool_stats import install_pool_stats
+
+
+def ensure_schema(engine: Engine) -> None:
+    """
+    Brings tables that already exist in line with the ORM models.
+
+    `create_all` skips tables that already exist (e.g. the ones created by the orchestrator),
+    and with them their indexes, so columns and indexes are reconciled separately here.
+    """
+    inspector = inspect(engine)
+    puzzle_columns = {
+        column["name"]: column for column in inspector.get_columns("time_lock_puzzles")
+    }
+    if "detected_completed" not in puzzle_columns:
+        # Tables created by older versions of this tool predate the column the orchestrator uses
+        with engine.begin() as connection:
+            connection.execute(
+                text("ALTER TABLE time_lock_puzzles ADD COLUMN detected_completed TIMESTAMP NULL")
+            )
+    for table in PARTITIONED_TABLES if PARTITIONED else ():
+        if "created_at" not in {column["name"] for column in inspector.get_columns(table)}:
+            # Plain tables from before partitioning was enabled; their rows keep a NULL time
+            with engine.begin() as connection:
+                connection.execute(
+                    text(f"ALTER TABLE {table} ADD COLUMN created_at TIMESTAMP NULL")
+                )
+    if LAZY_OUTPUT and not puzzle_columns["y"]["nullable"]:
+        # Lazy output mode stores puzzles without y
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as connection:
+                connection.execute(
+                    text("ALTER TABLE time_lock_puzzles ALTER COLUMN y DROP NOT NULL")
+                )
+        else:
+            print("Note: time_lock_puzzles.y is NOT NULL; recreate it to use lazy output mode.")
+    elif not LAZY_OUTPUT and puzzle_columns["y"]["nullable"]:
+        # Earlier versions relaxed the constraint on every deployment; restore it unless puzzles
+        # without y were stored since
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as connection:
+                if connection.execute(
+                    text("SELECT EXISTS (SELECT 1 FROM time_lock_puzzles WHERE y IS NULL)")
+                ).scalar():
+                    print(
+                        "Note: time_lock_puzzles.y stays nullable because some puzzles have no y; "
+                        "release them with `reveal.py --release` and re-run."
+                    )
+                else:
+                    connection.execute(
+                        text("ALTER TABLE time_lock_puzzles ALTER COLUMN y SET NOT NULL")
+                    )
+
+    if engine.dialect.name == "postgresql":
+        # Tables created by older versions of this tool lack the cascade the orchestrator's
+        # cleanup relies on when it deletes RSA keys before their puzzles
+        with engine.begin() as connection:
+            constraints = connection.execute(
+                text(
+                    """
+                    SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+                    WHERE conrelid = to_regclass('time_lock_puzzles') AND contype = 'f'
+                    AND confrelid = to_regclass('rsa_keys') AND conparentid = 0
+                    AND confdeltype <> 'c'
+                    """
+                )
+            ).all()
+            for name, definition in constraints:
+                print(f"Recreating {name} with ON DELETE CASCADE...")
+                connection.execute(text(f'ALTER TABLE time_lock_puzzles DROP CONSTRAINT "{name}"'))
+                connection.execute(
+                    text(
+                        f'ALTER TABLE time_lock_puzzles ADD CONSTRAINT "{name}" {definition} '
+                        "ON DELETE CASCADE"
+                    )
+                )
+
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"]: index for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            found = existing.get(index.name)
+            if found is not None and bool(found["unique"]) == bool(index.unique):
+                continue
+            # Missing, or an older non-unique version (the request_id index became unique)
+            print(f"Creating index {index.name}...")
+            try:
+                with engine.begin() as connection:
+                    if found is not None:
+                        index.drop(connection)
+                    index.create(connection)
+            except IntegrityError:
+                print(
+                    f"Note: {index.name} was not made unique because existing rows violate it; "
+                    "resolve the duplicates and re-run."
+                )
+
+    # Triggers are (re)created and the counters recounted on every run, which also repairs them
+    install_pool_stats(engine)
+
+    if PARTITIONED:
+        with engine.connect() as connection:
+            plain = [table for table in PARTITIONED_TABLES if not is_partitioned(connection, table)]
+        if plain:
+            # Converting a populated table means copying every row; left to the operator
+            print(
+                f"Note: {', '.join(plain)} already exist as plain tables; partitioning applies "
+                "to newly created tables only."
+            )
+        else:
+            for name in ensure_partitions(engine):
+                print(f"Created partition {name}")
 
 
 def initialize_database():
@@ -19,6 +133,7 @@ def initialize_database():
     try:
         print("Initializing the database...")
         Base.metadata.create_all(engine)
+        ensure_schema(engine)
         print("Database initialized successfully.")
     except OperationalError as e:
         print("Failed to initialize the database:", e)
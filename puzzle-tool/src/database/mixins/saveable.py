@@ -2,6 +2,10 @@ from src.database.database import save_instance
 
 
 class Saveable:
+    # Not a column: set on entities converted from insecure benchmark mode output, which
+    # check_persistable refuses to save, whether or not the mode is still enabled
+    insecure_benchmark = False
+
     def save(self) -> None:
         """
         Save the instance to the database.
@@ -0,0 +1,331 @@
+# src/database/partitions.py
+
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.database.constants import PARTITION_INTERVAL_HOURS, PARTITIONS_AHEAD
+from src.database.pool_stats import subtract_dropped
+
+# Parents before children: a puzzle partition references the key partition with the same bounds
+PARTITIONED_TABLES = ("rsa_keys", "time_lock_puzzles")
+
+_BOUNDS = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+# Serializes partition maintenance between the processes that run it (serve, workers, purge)
+_ENSURE_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('ensure_partitions'))"
+
+# How long retention waits for the table lock of a DETACH before leaving the partition for later
+_DETACH_LOCK_TIMEOUT = "2s"
+
+_last_ensured: Optional[float] = None  # time.monotonic() of this process's last ensure_partitions
+
+
+@dataclass
+class DroppedPartition:
+    """A pair of partitions (puzzles and their RSA keys) removed by retention."""
+
+    name: str  # Name of the time_lock_puzzles partition
+    start: datetime
+    end: datetime
+    puzzles: int
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, matching the created_at columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _interval_start(moment: datetime, interval: timedelta) -> datetime:
+    epoch = datetime(1970, 1, 1)
+    return epoch + ((moment - epoch) // interval) * interval
+
+
+def _partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y%m%d%H}"
+
+
+def is_partitioned(connection: Connection, table: str) -> bool:
+    """
+    Whether a table exists as a partitioned (rather than plain) PostgreSQL table.
+
+    :param connection: Connection to a PostgreSQL database.
+    :param table: Table name.
+    :return: True if the table is partitioned.
+    """
+    return (
+        connection.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        ).scalar()
+        == "p"
+    )
+
+
+def list_partitions(connection: Connection, table: str) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Lists the range partitions of a table, oldest first. The default partition is left out.
+
+    :param connection: Connection to a PostgreSQL database.
+    :param table: Partitioned table name.
+    :return: (name, start, end) of each partition.
+    """
+    rows = connection.execute(
+        text(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(:table)
+            """
+        ),
+        {"table": table},
+    ).all()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUNDS.search(bound)
+        if match:
+            start, end = (datetime.fromisoformat(value) for value in match.groups())
+            partitions.append((name, start, end))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(engine: Engine, ahead: int = PARTITIONS_AHEAD) -> List[str]:
+    """
+    Creates the partition for the current interval and the next `ahead` ones, plus a default
+    partition catching rows outside every range, for each partitioned table. Safe to re-run.
+
+    Rows that landed in the default partitions (a writer outlived the partitions created for it)
+    are moved into partitions of their own intervals, so the ranges can still be created and
+    retention can drop them like any other partition.
+
+    :param engine: Engine connected to PostgreSQL with partitioned tables.
+    :param ahead: Number of upcoming intervals to create partitions for.
+    :return: Names of the partitions created.
+    """
+    global _last_ensured
+    interval = timedelta(hours=PARTITION_INTERVAL_HOURS)
+    first = _interval_start(_utcnow(), interval)
+    created = []
+    with engine.begin() as connection:
+        connection.execute(text(_ENSURE_LOCK_SQL))
+        stranded = _stranded_intervals(connection, interval)
+        existing = {
+            table: {name for name, _, _ in list_partitions(connection, table)}
+            for table in PARTITIONED_TABLES
+        }
+        for start in sorted(stranded | {first + i * interval for i in range(ahead + 1)}):
+            missing = [
+                table
+                for table in PARTITIONED_TABLES
+                if _partition_name(table, start) not in existing[table]
+            ]
+            if start in stranded:
+                _relocate_default_rows(connection, missing, start, start + interval)
+            else:
+                for table in missing:
+                    connection.execute(
+                        text(
+                            f"CREATE TABLE {_partition_name(table, start)} PARTITION OF {table} "
+                            f"{_bounds(start, start + interval)}"
+                        )
+                    )
+            created.extend(_partition_name(table, start) for table in missing)
+        for table in PARTITIONED_TABLES:
+            connection.execute(
+                text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+            )
+    _last_ensured = time.monotonic()
+    return created
+
+
+def maintain_partitions(engine: Engine) -> List[str]:
+    """
+    Re-runs ensure_partitions once half an interval has passed since this process last ran it.
+
+    Long-running writers call this before writing, so they never outlive their partitions.
+
+    :param engine: Engine connected to PostgreSQL with partitioned tables.
+    :return: Names of the partitions created (empty if it was not due).
+    """
+    due_after = PARTITION_INTERVAL_HOURS * 3600 / 2
+    if _last_ensured is not None and time.monotonic() - _last_ensured < due_after:
+        return []
+    return ensure_partitions(engine)
+
+
+def _bounds(start: datetime, end: datetime) -> str:
+    return f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+
+def _stranded_intervals(connection: Connection, interval: timedelta) -> Set[datetime]:
+    """Starts of the intervals that have rows in a default partition."""
+    defaults = [
+        f"{table}_default"
+        for table in PARTITIONED_TABLES
+        if connection.execute(
+            text("SELECT to_regclass(:table)"), {"table": f"{table}_default"}
+        ).scalar()
+        is not None
+    ]
+    if not defaults:
+        return set()
+    # Blocks writes into the defaults until the rows are moved and the ranges attached; keys are
+    # locked before puzzles, in the order writers insert them
+    connection.execute(text(f"LOCK TABLE {', '.join(defaults)} IN ACCESS EXCLUSIVE MODE"))
+    buckets = connection.execute(
+        text(
+            " UNION ".join(
+                f"SELECT DISTINCT floor(extract(epoch FROM created_at) / :seconds) FROM {default}"
+                for default in defaults
+            )
+        ),
+        {"seconds": interval.total_seconds()},
+    ).scalars()
+    return {datetime(1970, 1, 1) + int(bucket) * interval for bucket in buckets}
+
+
+def _relocate_default_rows(
+    connection: Connection, tables: List[str], start: datetime, end: datetime
+) -> None:
+    """
+    Moves the rows of [start, end) out of the default partitions into new partitions.
+
+    A range overlapping rows of the default partition cannot be created directly, so the rows go
+    into plain tables first, which are then attached. The move is not seen by the pool_stats
+    triggers, which only fire for statements on time_lock_puzzles itself; the rows stay counted.
+    """
+    for table in tables:
+        connection.execute(
+            text(
+                f"CREATE TABLE {_partition_name(table, start)} "
+                f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+    # Puzzles first: deleting a key still referenced from the default would cascade to its puzzle
+    for table in reversed(tables):
+        connection.execute(
+            text(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {table}_default
+                    WHERE created_at >= :start AND created_at < :end
+                    RETURNING *
+                )
+                INSERT INTO {_partition_name(table, start)} SELECT * FROM moved
+                """
+            ),
+            {"start": start, "end": end},
+        )
+    for table in tables:
+        connection.execute(
+            text(
+                f"ALTER TABLE {table} ATTACH PARTITION {_partition_name(table, start)} "
+                f"{_bounds(start, end)}"
+            )
+        )
+
+
+def drop_completed_partitions(
+    engine: Engine, cutoff: datetime, dry_run: bool = False, limit: Optional[int] = None
+) -> List[DroppedPartition]:
+    """
+    Detaches and drops time_lock_puzzles partitions whose rows were all completed before
+    `cutoff`, together with the rsa_keys partition of the same range.
+
+    Only partitions whose range ended before `cutoff` are considered, so no new puzzle can still
+    be inserted into them. A partition holding any unassigned or still running puzzle is kept
+    (the row-wise purge handles those); that is checked with index-backed probes, before and
+    again right after detaching. Detaching locks the whole table, so nothing is scanned while the
+    lock is held: the detached partition is counted and dropped in a second transaction. A
+    partition left detached by an interrupted run is dropped by the next one.
+
+    :param engine: Engine connected to PostgreSQL with partitioned tables.
+    :param cutoff: Puzzles completed before this (naive UTC) may be removed.
+    :param dry_run: Only report the partitions that would be dropped.
+    :param limit: Stop after this many partitions (None for no limit).
+    :return: The partitions dropped (or that would be dropped).
+    """
+    with engine.connect() as connection:
+        leftovers = [] if dry_run else _detached_partitions(connection)
+        candidates = [
+            partition
+            for partition in list_partitions(connection, "time_lock_puzzles")
+            if partition[2] <= cutoff
+        ]
+
+    dropped = [_drop_detached(engine, *partition) for partition in leftovers[:limit]]
+    for name, start, end in candidates:
+        if limit is not None and len(dropped) >= limit:
+            break
+        with engine.connect() as connection:
+            if _has_pending(connection, name, cutoff):
+                continue
+            if dry_run:
+                puzzles = connection.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+                dropped.append(DroppedPartition(name, start, end, puzzles))
+                continue
+        try:
+            with engine.connect() as connection, connection.begin() as transaction:
+                # Rather skip the partition until the next run than queue every reader of the
+                # table behind a DETACH waiting for a long transaction
+                connection.execute(text(f"SET LOCAL lock_timeout = '{_DETACH_LOCK_TIMEOUT}'"))
+                connection.execute(text(f"ALTER TABLE time_lock_puzzles DETACH PARTITION {name}"))
+                if _has_pending(connection, name, cutoff):  # Changed since the first probe
+                    transaction.rollback()
+                    continue
+        except OperationalError:
+            continue
+        dropped.append(_drop_detached(engine, name, start, end))
+    return dropped
+
+
+def _has_pending(connection: Connection, name: str, cutoff: datetime) -> bool:
+    """Whether a puzzle partition holds a puzzle not completed before `cutoff`."""
+    # Two probes, each answered from the detected_completed index
+    return connection.execute(
+        text(
+            f"""
+            SELECT EXISTS (SELECT 1 FROM {name} WHERE detected_completed IS NULL)
+                OR EXISTS (SELECT 1 FROM {name} WHERE detected_completed >= :cutoff)
+            """
+        ),
+        {"cutoff": cutoff},
+    ).scalar()
+
+
+def _detached_partitions(connection: Connection) -> List[Tuple[str, datetime, datetime]]:
+    """Puzzle partitions detached by drop_completed_partitions but not dropped yet."""
+    interval = timedelta(hours=PARTITION_INTERVAL_HOURS)
+    names = connection.execute(
+        text(
+            r"""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND NOT relispartition AND pg_table_is_visible(oid)
+            AND relname ~ '^time_lock_puzzles_p\d{10}$'
+            """
+        )
+    ).scalars()
+    partitions = []
+    for name in names:
+        start = datetime.strptime(name[-10:], "%Y%m%d%H")
+        partitions.append((name, start, start + interval))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def _drop_detached(engine: Engine, name: str, start: datetime, end: datetime) -> DroppedPartition:
+    """Counts and drops a detached puzzle partition, then the rsa_keys partition of its range."""
+    with engine.begin() as connection:
+        puzzles = connection.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+        connection.execute(text(f"DROP TABLE {name}"))
+        subtract_dropped(connection, puzzles)
+        for keys_name, keys_start, keys_end in list_partitions(connection, "rsa_keys"):
+            if (keys_start, keys_end) == (start, end):
+                connection.execute(text(f"ALTER TABLE rsa_keys DETACH PARTITION {keys_name}"))
+                connection.execute(text(f"DROP TABLE {keys_name}"))
+    return DroppedPartition(name, start, end, puzzles)
@@ -0,0 +1,143 @@
+# src/database/pool_stats.py
+
+from sqlalchemy import Connection, Engine, text
+
+# Counter rows on PostgreSQL; each backend updates slot (pid % slots). SQLite has one writer.
+POSTGRESQL_SLOTS = 16
+
+# Statement-level: one counter update per INSERT/UPDATE/DELETE statement, however many rows it
+# touches. The transition tables only exist for the events that define them; PL/pgSQL plans each
+# branch lazily, so a branch for another event never references a missing table.
+_POSTGRESQL_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION pool_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    d_total BIGINT := 0;
+    d_unassigned BIGINT := 0;
+    n_total BIGINT;
+    n_unassigned BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT count(*), count(*) FILTER (WHERE request_id IS NULL)
+        INTO n_total, n_unassigned FROM new_rows;
+        d_total := d_total + n_total;
+        d_unassigned := d_unassigned + n_unassigned;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT count(*), count(*) FILTER (WHERE request_id IS NULL)
+        INTO n_total, n_unassigned FROM old_rows;
+        d_total := d_total - n_total;
+        d_unassigned := d_unassigned - n_unassigned;
+    END IF;
+    IF d_total <> 0 OR d_unassigned <> 0 THEN
+        UPDATE pool_stats
+        SET total = total + d_total, unassigned = unassigned + d_unassigned
+        WHERE slot = pg_backend_pid() % {POSTGRESQL_SLOTS};
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+_POSTGRESQL_TRIGGERS = [
+    """
+    CREATE TRIGGER pool_stats_insert AFTER INSERT ON time_lock_puzzles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION pool_stats_apply()
+    """,
+    """
+    CREATE TRIGGER pool_stats_update AFTER UPDATE ON time_lock_puzzles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION pool_stats_apply()
+    """,
+    """
+    CREATE TRIGGER pool_stats_delete AFTER DELETE ON time_lock_puzzles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION pool_stats_apply()
+    """,
+]
+
+# SQLite only has row-level triggers; with a single writer at a time they cannot contend
+_SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER pool_stats_insert AFTER INSERT ON time_lock_puzzles
+    BEGIN
+        UPDATE pool_stats
+        SET total = total + 1, unassigned = unassigned + (NEW.request_id IS NULL)
+        WHERE slot = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER pool_stats_update AFTER UPDATE OF request_id ON time_lock_puzzles
+    WHEN (OLD.request_id IS NULL) <> (NEW.request_id IS NULL)
+    BEGIN
+        UPDATE pool_stats
+        SET unassigned = unassigned + (NEW.request_id IS NULL) - (OLD.request_id IS NULL)
+        WHERE slot = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER pool_stats_delete AFTER DELETE ON time_lock_puzzles
+    BEGIN
+        UPDATE pool_stats
+        SET total = total - 1, unassigned = unassigned - (OLD.request_id IS NULL)
+        WHERE slot = 0;
+    END
+    """,
+]
+
+_TRIGGER_NAMES = ("pool_stats_insert", "pool_stats_update", "pool_stats_delete")
+
+
+def install_pool_stats(engine: Engine) -> None:
+    """
+    (Re)installs the pool_stats triggers and recounts the counters from time_lock_puzzles.
+
+    Runs in one transaction that blocks writes to time_lock_puzzles, so no change is counted
+    twice or missed. The one full count happens here, not on every read.
+
+    :param engine: Engine whose database has the pool_stats and time_lock_puzzles tables.
+    """
+    postgresql = engine.dialect.name == "postgresql"
+    with engine.begin() as connection:
+        if postgresql:
+            connection.execute(text("LOCK TABLE time_lock_puzzles IN SHARE ROW EXCLUSIVE MODE"))
+            connection.execute(text(_POSTGRESQL_FUNCTION))
+        for name in _TRIGGER_NAMES:
+            on_table = " ON time_lock_puzzles" if postgresql else ""
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {name}{on_table}"))
+        for trigger in _POSTGRESQL_TRIGGERS if postgresql else _SQLITE_TRIGGERS:
+            connection.execute(text(trigger))
+        _recount(connection, POSTGRESQL_SLOTS if postgresql else 1)
+
+
+def subtract_dropped(connection: Connection, puzzles: int) -> None:
+    """
+    Accounts for assigned puzzles removed without a DELETE (a dropped partition fires no trigger).
+
+    :param connection: Connection inside the transaction that removed the puzzles.
+    :param puzzles: Number of puzzles removed; all of them must have been assigned.
+    """
+    if connection.execute(text("SELECT to_regclass('pool_stats')")).scalar() is not None:
+        connection.execute(
+            text("UPDATE pool_stats SET total = total - :puzzles WHERE slot = 0"),
+            {"puzzles": puzzles},
+        )
+
+
+def _recount(connection: Connection, slots: int) -> None:
+    total, unassigned = connection.execute(
+        text(
+            "SELECT count(*), count(*) FILTER (WHERE request_id IS NULL) FROM time_lock_puzzles"
+        )
+    ).one()
+    connection.execute(text("DELETE FROM pool_stats"))
+    connection.execute(
+        text(
+            "INSERT INTO pool_stats (slot, total, unassigned) "
+            "VALUES (:slot, :total, :unassigned)"
+        ),
+        [
+            {"slot": 0, "total": total, "unassigned": unassigned},
+            *({"slot": slot, "total": 0, "unassigned": 0} for slot in range(1, slots)),
+        ],
+    )
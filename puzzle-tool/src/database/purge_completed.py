@@ -0,0 +1,213 @@
+# src/database/purge_completed.py
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select
+
+# Dynamically add the `src` directory to `sys.path`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from src.database.entity import RSAEntity, TimeLockPuzzleEntity
+
+from src.database.database import get_engine, session_scope
+from src.database.constants import PARTITIONED
+from src.database.partitions import drop_completed_partitions, ensure_partitions
+
+DEFAULT_RETENTION_SECONDS = 2 * 60 * 60  # Mirrors the orchestrator's COMPLETION_RETENTION_PERIOD_MS
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_PAUSE_SECONDS = 0.05
+
+
+@dataclass
+class PurgeReport:
+    """Outcome of a purge run (or, for a dry run, what a purge run would do)."""
+
+    cutoff: datetime
+    dry_run: bool
+    puzzles: int = 0  # Puzzles deleted (or eligible, for a dry run)
+    keys: int = 0  # RSA keys deleted (or eligible, for a dry run)
+    chunks: int = 0  # Transactions committed (or that would be committed)
+    partitions: List[str] = field(default_factory=list)  # Puzzle partitions dropped whole
+    chunk_seconds: List[float] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        verb = "Would purge" if self.dry_run else "Purged"
+        lines = [
+            f"{verb} {self.puzzles} puzzles and {self.keys} RSA keys completed before "
+            f"{self.cutoff.isoformat()} in {self.chunks} chunk(s)"
+        ]
+        if self.partitions:
+            lines.append(
+                f"{'Would drop' if self.dry_run else 'Dropped'} {len(self.partitions)} "
+                f"partition(s) (counted above): {', '.join(self.partitions)}"
+            )
+        if self.chunk_seconds:
+            lines.append(
+                f"Chunk transaction time: max {max(self.chunk_seconds) * 1000:.1f} ms, "
+                f"avg {sum(self.chunk_seconds) / len(self.chunk_seconds) * 1000:.1f} ms"
+            )
+        lines.append(f"Total time: {self.elapsed_seconds:.2f} seconds")
+        return "\n".join(lines)
+
+
+def _purge_chunk(cutoff: datetime, chunk_size: int) -> int:
+    """
+    Deletes up to `chunk_size` of the oldest completed puzzles and their RSA keys in one short
+    transaction.
+
+    Rows are walked in `detected_completed` order so the scan is served by its index. Rows another
+    transaction holds (e.g. the orchestrator mid-update) are skipped rather than waited on; they are
+    picked up by a later chunk or run. Generation only inserts unassigned rows, which never match.
+
+    :return: Number of puzzles deleted.
+    """
+    with session_scope() as session:
+        rows = session.execute(
+            select(TimeLockPuzzleEntity.id, TimeLockPuzzleEntity.rsa_id)
+            .where(TimeLockPuzzleEntity.detected_completed < cutoff)
+            .order_by(TimeLockPuzzleEntity.detected_completed)
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            return 0
+
+        puzzle_ids = [row.id for row in rows]
+        rsa_ids = [row.rsa_id for row in rows]
+        # Puzzles first: they hold the foreign key to rsa_keys
+        session.execute(
+            delete(TimeLockPuzzleEntity)
+            .where(TimeLockPuzzleEntity.id.in_(puzzle_ids))
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(
+            delete(RSAEntity)
+            .where(RSAEntity.id.in_(rsa_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return len(rows)
+
+
+def _count_eligible(cutoff: datetime) -> int:
+    with session_scope() as session:
+        return session.execute(
+            select(func.count())
+            .select_from(TimeLockPuzzleEntity)
+            .where(TimeLockPuzzleEntity.detected_completed < cutoff)
+        ).scalar_one()
+
+
+def purge_completed(
+    retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+    dry_run: bool = False,
+    max_chunks: Optional[int] = None,
+) -> PurgeReport:
+    """
+    Purges puzzles (and their RSA keys) that were marked completed more than
+    `retention_seconds` ago, one bounded transaction per chunk.
+
+    :param retention_seconds: How long a completed puzzle is kept after `detected_completed`.
+    :param chunk_size: Maximum puzzles deleted per transaction.
+    :param pause_seconds: Sleep between chunks, to throttle WAL and I/O pressure.
+    :param dry_run: Only report what would be deleted.
+    :param max_chunks: Stop after this many chunks (None for no limit).
+    :return: Report of the run.
+    """
+    # Naive UTC, matching the orchestrator's `detected_completed = NOW()` TIMESTAMP column
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=retention_seconds)
+    report = PurgeReport(cutoff=cutoff, dry_run=dry_run)
+    start_time = time.time()
+
+    if PARTITIONED:
+        # Whole partitions of completed puzzles go first, without touching rows; the chunked purge
+        # below only handles partitions that still hold other puzzles
+        engine = get_engine()
+        if not dry_run:
+            ensure_partitions(engine)
+        for partition in drop_completed_partitions(engine, cutoff, dry_run):
+            report.partitions.append(partition.name)
+            report.puzzles += partition.puzzles
+            report.keys += partition.puzzles
+
+    if dry_run:
+        eligible = _count_eligible(cutoff) - report.puzzles  # Rows in droppable partitions
+        report.chunks = -(-eligible // chunk_size)  # ceil
+        if max_chunks is not None and report.chunks > max_chunks:
+            report.chunks = max_chunks
+            eligible = min(eligible, max_chunks * chunk_size)
+        report.puzzles += eligible
+        report.keys += eligible
+    else:
+        while max_chunks is None or report.chunks < max_chunks:
+            chunk_start = time.time()
+            deleted = _purge_chunk(cutoff, chunk_size)
+            if deleted == 0:
+                break
+            report.chunk_seconds.append(time.time() - chunk_start)
+            report.chunks += 1
+            report.puzzles += deleted
+            report.keys += deleted  # Keys are one-to-one with puzzles
+            # A short chunk does not mean the purge is done: rows locked by other transactions
+            # were skipped and may be free by the next chunk. Only an empty chunk ends the run.
+            time.sleep(pause_seconds)
+
+    report.elapsed_seconds = time.time() - start_time
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Purge completed time lock puzzles and their RSA keys in bounded chunks."
+    )
+    parser.add_argument(
+        "--retention-seconds",
+        type=float,
+        default=DEFAULT_RETENTION_SECONDS,
+        help="Keep completed puzzles for this long after detected_completed (default: 2 hours)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Maximum puzzles deleted per transaction",
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=DEFAULT_PAUSE_SECONDS,
+        help="Seconds to sleep between chunks",
+    )
+    parser.add_argument(
+        "--max-chunks",
+        type=int,
+        default=None,
+        help="Stop after this many chunks",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report what would be purged",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(
+        purge_completed(
+            retention_seconds=args.retention_seconds,
+            chunk_size=args.chunk_size,
+            pause_seconds=args.pause,
+            dry_run=args.dry_run,
+            max_chunks=args.max_chunks,
+        )
+    )
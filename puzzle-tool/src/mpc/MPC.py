@@ -33,3 +33,7 @@ class MPC(IMPC):
     @staticmethod
     def mod(value: MPZ, modulus: MPZ) -> MPZ:
         return value % modulus  # gmpy2 supports % operator for mpz values
+
+    @staticmethod
+    def invert(value: MPZ, modulus: MPZ) -> MPZ:
+        return gmpy2.invert(value, modulus)
@@ -93,3 +93,16 @@ class IMPC(ABC):
         Returns:
             mpz: Result of modular reduction
         """
+
+    @staticmethod
+    @abstractmethod
+    def invert(value: MPZ, modulus: MPZ) -> MPZ:
+        """Compute the modular inverse of value modulo modulus.
+
+        Args:
+            value (mpz): Value to invert
+            modulus (mpz): Modulus to invert in
+
+        Returns:
+            mpz: y such that (value * y) % modulus == 1
+        """
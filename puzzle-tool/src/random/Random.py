@@ -1,13 +1,70 @@
+import hashlib
+import hmac
 import secrets
+from typing import Optional
+
 from ..mpc import MPC
 from ..mpc.types import RandomState
 from .abstract.IRandom import IRandom
 
 
+class _HmacDrbg:
+    """HMAC-SHA256 in counter mode over a key derived from (seed, stream). NOT for secrets."""
+
+    def __init__(self, seed: int, stream: str) -> None:
+        self._key = hashlib.sha256(f"{seed}/{stream}".encode()).digest()
+        self._counter = 0
+
+    def randbits(self, bit_size: int) -> int:
+        blocks = []
+        for _ in range(-(-bit_size // 256)):  # ceil
+            blocks.append(
+                hmac.new(self._key, self._counter.to_bytes(8, "big"), hashlib.sha256).digest()
+            )
+            self._counter += 1
+        return int.from_bytes(b"".join(blocks), "big") >> (len(blocks) * 256 - bit_size)
+
+
+# Set only in insecure benchmark mode; None means seeds come from `secrets`
+_insecure_seed: Optional[int] = None
+_insecure_drbg: Optional[_HmacDrbg] = None
+
+
 class Random(IRandom):
     """Implementation of secure random number generation."""
 
     @staticmethod
     def get_random(bit_size: int) -> RandomState:
+        if _insecure_drbg is not None:
+            return MPC.random_state(_insecure_drbg.randbits(bit_size))
         secure_seed = secrets.randbits(bit_size)
         return MPC.random_state(secure_seed)
+
+    @staticmethod
+    def enable_insecure_benchmark_mode(seed: int, stream: str = "main") -> None:
+        """INSECURE: derive every random state of this process from `seed` from now on.
+
+        Makes primes, keys and puzzle inputs reproducible, and therefore worthless as puzzles.
+        For benchmarking and profiling only; puzzles generated this way are refused by every
+        database save path. Each `stream` name gives an independent sequence for the same seed,
+        so parallel tasks can be split deterministically.
+
+        Args:
+            seed (int): Benchmark seed
+            stream (str): Name of the sequence drawn from (e.g. one per task)
+        """
+        global _insecure_seed, _insecure_drbg
+        _insecure_seed = seed
+        _insecure_drbg = _HmacDrbg(seed, stream)
+
+    @staticmethod
+    def disable_insecure_benchmark_mode() -> None:
+        """Return to secure seeds from `secrets`."""
+        global _insecure_seed, _insecure_drbg
+        _insecure_seed = None
+        _insecure_drbg = None
+
+    @staticmethod
+    def get_insecure_seed() -> Optional[int]:
+        """The benchmark seed if insecure benchmark mode is enabled in this process, else None."""
+        return _insecure_seed
@@ -2,6 +2,7 @@ from ..mpc import MPC
 from ..mpc.types import MPZ
 from .abstract.IRSA import IRSA
 from ..primes import Primes
+from ..random import Random
 
 
 class RSA(IRSA):
@@ -25,6 +26,9 @@ class RSA(IRSA):
         self._N = self._calculate_N()
         self._phi = self._calculate_phi()
 
+        # Primes drawn in insecure benchmark mode are predictable; the mark outlives the mode
+        self._insecure = Random.get_insecure_seed() is not None
+
     def get_p(self) -> MPZ:
         return self._p
 
@@ -40,6 +44,10 @@ class RSA(IRSA):
     def get_eulers_totient(self) -> MPZ:
         return self.get_phi()
 
+    def is_insecure(self) -> bool:
+        """Whether the key was generated in insecure benchmark mode and must never be saved."""
+        return self._insecure
+
     # Private methods
     # --------------
 
@@ -0,0 +1,89 @@
+"""Minimal asyncio HTTP/1.1 server for local JSON endpoints."""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+Query = Dict[str, List[str]]
+Handler = Callable[[Query], Awaitable[Tuple[int, Any]]]
+
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class JsonHttpServer:
+    """Serves GET routes that return JSON, on localhost TCP or a Unix socket.
+
+    This is intentionally tiny (one request per connection, no request bodies) so the local
+    services need nothing beyond the standard library.
+    """
+
+    def __init__(self, routes: Dict[str, Handler]) -> None:
+        """Initialize the server.
+
+        Args:
+            routes (Dict[str, Handler]): Map of path -> async handler returning (status, payload)
+        """
+        self._routes = routes
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 8080, unix_socket: Optional[str] = None
+    ) -> None:
+        """Start listening, on `unix_socket` if given, otherwise on `host`:`port`."""
+        if unix_socket:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_socket)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # Private Methods
+    # ------------------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # Headers are not needed
+
+            if len(request_line) < 2:
+                status, payload = 400, {"error": "malformed request"}
+            elif request_line[0] != "GET":
+                status, payload = 405, {"error": "only GET is supported"}
+            else:
+                url = urlsplit(request_line[1])
+                handler = self._routes.get(url.path)
+                if handler is None:
+                    status, payload = 404, {"error": f"unknown path {url.path}"}
+                else:
+                    try:
+                        status, payload = await handler(parse_qs(url.query))
+                    except ValueError as e:
+                        status, payload = 400, {"error": str(e)}
+                    except Exception as e:  # pylint: disable=broad-except
+                        status, payload = 500, {"error": str(e)}
+
+            body = json.dumps(payload).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
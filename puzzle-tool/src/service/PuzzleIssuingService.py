@@ -0,0 +1,245 @@
+"""Local service that issues time lock puzzles from an in-memory prefetch buffer."""
+
+import asyncio
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete
+
+from ..converters.rsa_converter import RSAConverter
+from ..converters.time_lock_puzzle_converter import TimeLockPuzzleConverter
+from ..database.DatabaseService import DatabaseService
+from ..database.constants import PARTITIONED
+from ..database.database import check_persistable, get_engine, session_scope
+from ..database.entity.RSAEntity import RSAEntity
+from ..database.entity.TimeLockPuzzleEntity import TimeLockPuzzleEntity
+from ..database.partitions import maintain_partitions
+from ..mpc.types import MPZ
+from ..rsa.RSA import RSA
+from ..time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
+from ..time_lock_puzzle.TimeLockPuzzleFactory import TimeLockPuzzleFactory
+from .JsonHttpServer import JsonHttpServer, Query
+
+# request_id stored on the service's puzzles: they are handed out by the service, so they must
+# never enter the unassigned pool (request_id IS NULL) where claim() or the orchestrator would hand
+# them out again. The orchestrator's cleanup skips this prefix, so their RSA keys are kept.
+ISSUED_REQUEST_PREFIX = "issued:"
+
+
+class PuzzleIssuingService:
+    """Keeps a bounded buffer of freshly generated puzzles and hands them out on request.
+
+    A pool of worker processes keeps the buffer topped up. Generated puzzles (with their RSA keys
+    and outputs) are persisted in batches, at least every `persist_interval` seconds, and only
+    enter the buffer once committed, so a crash never loses the trapdoor of an issued puzzle.
+    Issuing then pops from the buffer without touching the database. Puzzles are persisted as
+    taken, with request_id `issued:<puzzle id>`, so they never join the unassigned pool; those
+    still buffered on `stop()` are deleted again.
+    """
+
+    def __init__(
+        self,
+        bit_size: int,
+        timing_parameter: MPZ,
+        capacity: int = 64,
+        workers: int = 1,
+        persist_batch_size: int = 32,
+        persist_interval: float = 1.0,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            bit_size (int): Number of bits for RSA parameters
+            timing_parameter (MPZ): Time parameter t for puzzles
+            capacity (int): Maximum puzzles held in the buffer
+            workers (int): Number of generator processes refilling the buffer
+            persist_batch_size (int): Generated puzzles written per database transaction
+            persist_interval (float): Maximum seconds a generated puzzle waits before being
+                persisted (and issuable)
+        """
+        self._bit_size = bit_size
+        self._t = timing_parameter
+        self._capacity = capacity
+        self._workers = workers
+        self._persist_batch_size = persist_batch_size
+        self._persist_interval = persist_interval
+
+        self._buffer: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None  # Puzzles generating, pending or buffered
+        self._to_persist: List[TimeLockPuzzleEntity | RSAEntity] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._refill_tasks: List[asyncio.Task] = []
+        self._persist_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._generated = 0
+        self._issued = 0
+        self._persisted = 0
+        self._refill_failures = 0
+
+    async def start(self) -> None:
+        """Start the refill workers and the background persister."""
+        self._buffer = asyncio.Queue(maxsize=self._capacity)
+        self._slots = asyncio.Semaphore(self._capacity)
+        self._executor = ProcessPoolExecutor(self._workers)
+        self._refill_tasks = [self._start_refill() for _ in range(self._workers)]
+        self._persist_task = asyncio.create_task(self._persist_loop())
+
+    async def stop(self) -> None:
+        """Stop refilling and delete the buffered puzzles that were never issued.
+
+        Buffered puzzles were never handed out, so they are dropped from the buffer and the database.
+        """
+        self._stopping = True
+        for task in self._refill_tasks:
+            task.cancel()
+        await asyncio.gather(*self._refill_tasks, return_exceptions=True)
+        self._executor.shutdown(cancel_futures=True)
+        # Persistence is never cancelled mid-batch: let the loop drain and exit on its own
+        await self._persist_task
+        unissued = []
+        while not self._buffer.empty():
+            unissued.append(self._buffer.get_nowait().id)
+        if unissued:
+            await asyncio.get_running_loop().run_in_executor(None, _delete_with_keys, unissued)
+
+    def issue(self, count: int) -> List[Dict[str, str]]:
+        """Pop up to `count` puzzles from the buffer without waiting for generation.
+
+        Args:
+            count (int): Number of puzzles wanted
+
+        Returns:
+            List[Dict[str, str]]: Public puzzle parameters (id, hex x, t, hex N); may be shorter
+            than `count` if the buffer is running low
+        """
+        issued = []
+        while len(issued) < count and not self._buffer.empty():
+            puzzle_entity = self._buffer.get_nowait()
+            self._slots.release()
+            issued.append(
+                {
+                    "id": puzzle_entity.id,
+                    "x": puzzle_entity.x,
+                    "t": puzzle_entity.t,
+                    "N": puzzle_entity.modulus,
+                }
+            )
+        self._issued += len(issued)
+        return issued
+
+    def stats(self) -> Dict[str, int]:
+        """Buffer depth and lifetime counters."""
+        return {
+            "buffer_depth": self._buffer.qsize(),
+            "buffer_capacity": self._capacity,
+            "generated": self._generated,
+            "issued": self._issued,
+            "persisted": self._persisted,
+            "pending_persist": len(self._to_persist) // 2,
+            "refill_failures": self._refill_failures,
+        }
+
+    def routes(self) -> Dict[str, Any]:
+        """HTTP routes for a JsonHttpServer."""
+        return {"/puzzles": self._get_puzzles, "/stats": self._get_stats}
+
+    # Private Methods
+    # ------------------------------------------------------------------------------
+
+    async def _get_puzzles(self, query: Query) -> Tuple[int, Any]:
+        count = int(query.get("count", ["1"])[0])
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        puzzles = self.issue(count)
+        return 200, {"requested": count, "puzzles": puzzles}
+
+    async def _get_stats(self, _query: Query) -> Tuple[int, Any]:
+        return 200, self.stats()
+
+    def _start_refill(self) -> asyncio.Task:
+        task = asyncio.create_task(self._refill())
+        task.add_done_callback(self._on_refill_done)
+        return task
+
+    def _on_refill_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        self._refill_failures += 1
+        print("Refilling the puzzle buffer failed, restarting the refill worker:")
+        traceback.print_exception(task.exception())
+        if not self._stopping:
+            self._refill_tasks[self._refill_tasks.index(task)] = self._start_refill()
+
+    async def _refill(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()  # Blocks while the buffer and the pending batch are full
+            try:
+                puzzle, rsa, y = await loop.run_in_executor(
+                    self._executor, _create_puzzle, self._bit_size, self._t
+                )
+            except BaseException:
+                self._slots.release()
+                raise
+            self._generated += 1
+            rsa_entity = RSAConverter.to_entity(rsa)
+            puzzle_entity = TimeLockPuzzleConverter.to_entity(
+                puzzle, rsa_entity.id, y, rsa_entity.created_at
+            )
+            puzzle_entity.request_id = f"{ISSUED_REQUEST_PREFIX}{puzzle_entity.id}"
+            try:
+                # Before it can be persisted and issued, rather than at save time, where it would
+                # be retried forever
+                check_persistable([rsa_entity, puzzle_entity])
+            except RuntimeError:
+                self._slots.release()
+                raise
+            self._to_persist.extend([rsa_entity, puzzle_entity])
+
+    async def _persist_loop(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self._persist_interval)
+            try:
+                while self._to_persist:
+                    await self._persist_batch()
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Persisting issued puzzles failed, retrying next interval: {e}")
+        while self._to_persist:
+            await self._persist_batch()
+
+    async def _persist_batch(self) -> None:
+        batch = self._to_persist[: 2 * self._persist_batch_size]  # (RSA, puzzle) entity pairs
+        del self._to_persist[: len(batch)]
+        loop = asyncio.get_running_loop()
+        try:
+            if PARTITIONED:  # The service runs for days; keep partitions ahead of created_at
+                await loop.run_in_executor(None, maintain_partitions, get_engine())
+            await loop.run_in_executor(None, DatabaseService.save_many, batch)
+        except Exception:
+            self._to_persist[:0] = batch  # Keep them for the next attempt
+            raise
+        self._persisted += len(batch) // 2
+        for entity in batch:
+            if isinstance(entity, TimeLockPuzzleEntity):
+                self._buffer.put_nowait(entity)  # Has room: every puzzle holds a slot
+
+
+def _create_puzzle(bit_size: int, t: MPZ) -> Tuple[TimeLockPuzzle, RSA, MPZ]:
+    """Generate one puzzle in a worker process."""
+    return TimeLockPuzzleFactory(bit_size, t).create_puzzle()
+
+
+def _delete_with_keys(puzzle_ids: List[str]) -> None:
+    """Delete persisted puzzles that were never issued, with their RSA keys."""
+    with session_scope() as session:
+        rsa_ids = (
+            session.execute(
+                delete(TimeLockPuzzleEntity)
+                .where(TimeLockPuzzleEntity.id.in_(puzzle_ids))
+                .returning(TimeLockPuzzleEntity.rsa_id)
+            )
+            .scalars()
+            .all()
+        )
+        session.execute(delete(RSAEntity).where(RSAEntity.id.in_(rsa_ids)))
@@ -0,0 +1,125 @@
+"""On-disk, content-addressed cache of solved puzzle outputs."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from ..mpc.types import MPZ
+
+
+class ResultCache:
+    """Stores y = x^(2^t) mod N in files named by the hash of (x, t, N).
+
+    Entries are evicted least recently used first once their total size exceeds `max_bytes`.
+    Recency is kept in memory and mirrored in file mtimes, so it survives restarts. Lookups of
+    keys that are not cached never touch the disk.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """Initialize the cache, indexing entries left by earlier runs.
+
+        Args:
+            directory (str): Directory holding the entries (created if missing)
+            max_bytes (int): Maximum total size of the entries
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for shard in os.scandir(directory):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._bytes += size
+
+    @staticmethod
+    def key(x: MPZ, t: MPZ, N: MPZ) -> str:
+        """Content hash identifying a puzzle, independent of how its numbers were written."""
+        return hashlib.sha256(f"{int(x):x}:{int(t)}:{int(N):x}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached output.
+
+        Args:
+            key (str): Puzzle key from `key()`
+
+        Returns:
+            Optional[str]: Hex string of y, or None if not cached
+        """
+        with self._lock:
+            if key not in self._sizes:
+                self.misses += 1
+                return None
+            self._sizes.move_to_end(key)
+        try:
+            path = self._path(key)
+            with open(path, encoding="ascii") as f:
+                y_hex = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Removed behind our back; treat as a miss
+            with self._lock:
+                self._bytes -= self._sizes.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return y_hex
+
+    def put(self, key: str, y_hex: str) -> None:
+        """Store an output, evicting the least recently used entries if over the size limit.
+
+        Args:
+            key (str): Puzzle key from `key()`
+            y_hex (str): Hex string of y
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="ascii") as f:
+            f.write(y_hex)
+        os.replace(tmp_path, path)  # Readers never see a partial entry
+
+        with self._lock:
+            self._bytes -= self._sizes.pop(key, 0)
+            self._sizes[key] = len(y_hex)
+            self._bytes += len(y_hex)
+            evicted = []
+            while self._bytes > self._max_bytes and len(self._sizes) > 1:
+                old_key, size = self._sizes.popitem(last=False)
+                self._bytes -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, total size and lifetime hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._sizes),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    # Private Methods
+    # ------------------------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], key)
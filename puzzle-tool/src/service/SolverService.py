@@ -0,0 +1,167 @@
+"""Local service that solves time lock puzzles once and remembers the results."""
+
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+from ..mpc import MPC
+from ..mpc.types import MPZ
+from ..time_lock_puzzle.SolverHandle import DEFAULT_STEP, SolverHandle
+from ..time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
+from .JsonHttpServer import Query
+from .ResultCache import ResultCache
+
+SOURCE_CACHE = "cache"  # Answered from the result cache
+SOURCE_ATTACHED = "attached"  # Joined a job another request had already started
+SOURCE_SOLVED = "solved"  # Started a new job
+
+
+class SolverService:
+    """Solves puzzles by sequential squaring, deduplicating work across requests.
+
+    Requests are keyed by the content hash of (x, t, N). A cached result is returned straight
+    away; a request for a puzzle that is already being solved waits on that job instead of
+    starting another squaring chain. New jobs wait for one of `workers` slots and each runs in
+    its own `SolverHandle` worker process. A job keeps running when the requests waiting on it
+    go away, so an orchestrator retry finds it in flight or in the cache.
+    """
+
+    def __init__(
+        self,
+        cache: ResultCache,
+        workers: int = 1,
+        step: int = DEFAULT_STEP,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            cache (ResultCache): Where finished results are stored
+            workers (int): Maximum puzzles solved at the same time
+            step (int): Squarings between progress updates of a running job
+        """
+        self._cache = cache
+        self._workers = workers
+        self._step = step
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._handles: Dict[str, SolverHandle] = {}
+        self._queued = 0
+        self._attached = 0
+        self._solved = 0
+        self._failed = 0
+
+    async def start(self) -> None:
+        self._slots = asyncio.Semaphore(self._workers)
+
+    async def stop(self) -> None:
+        """Cancel every queued and running job."""
+        for handle in self._handles.values():
+            handle.cancel()
+        jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+    async def solve(self, x: MPZ, t: MPZ, N: MPZ, wait: bool = True) -> Tuple[Optional[str], str]:
+        """Get the output of a puzzle, solving it unless cached or already being solved.
+
+        Args:
+            x (MPZ): Puzzle input
+            t (MPZ): Number of squarings
+            N (MPZ): Modulus
+            wait (bool): Whether to wait for the result; if False, a job is started (or found)
+                and None is returned when the result is not known yet
+
+        Returns:
+            Tuple[Optional[str], str]: Hex string of y (or None) and where it came from
+        """
+        key = ResultCache.key(x, t, N)
+        y_hex = self._cache.get(key)
+        if y_hex is not None:
+            return y_hex, SOURCE_CACHE
+
+        job = self._jobs.get(key)
+        if job is None:
+            source = SOURCE_SOLVED
+            job = asyncio.create_task(self._run(key, TimeLockPuzzle(x, t, N)))
+            self._jobs[key] = job
+            job.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            source = SOURCE_ATTACHED
+            self._attached += 1
+
+        if not wait:
+            return (job.result() if job.done() else None), source
+        # Shielded: a waiter that goes away must not cancel the job for everyone else
+        return await asyncio.shield(job), source
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running jobs with their progress, and cache counters."""
+        running = {}
+        for key, handle in self._handles.items():
+            progress = handle.latest_progress
+            running[key] = {
+                "squarings_done": progress.squarings_done if progress else 0,
+                "eta_seconds": progress.eta_seconds if progress else None,
+            }
+        return {
+            "workers": self._workers,
+            "queue_depth": self._queued,
+            "running": running,
+            "attached": self._attached,
+            "solved": self._solved,
+            "failed": self._failed,
+            "cache": self._cache.stats(),
+        }
+
+    def routes(self) -> Dict[str, Any]:
+        """HTTP routes for a JsonHttpServer."""
+        return {"/solve": self._get_solve, "/stats": self._get_stats}
+
+    # Private Methods
+    # ------------------------------------------------------------------------------
+
+    async def _get_solve(self, query: Query) -> Tuple[int, Any]:
+        try:
+            x = MPC.mpz(int(query["x"][0], 16))
+            t = MPC.mpz(int(query["t"][0]))
+            N = MPC.mpz(int(query["N"][0], 16))
+        except KeyError as e:
+            raise ValueError(f"missing parameter {e}") from e
+        if t < 0 or N < 2:
+            raise ValueError("t must be non-negative and N at least 2")
+        wait = query.get("wait", ["1"])[0] not in ("0", "false")
+
+        y_hex, source = await self.solve(x, t, N, wait)
+        if y_hex is None:
+            return 202, {"status": "pending", "source": source}
+        return 200, {"y": y_hex, "source": source}
+
+    async def _get_stats(self, _query: Query) -> Tuple[int, Any]:
+        return 200, self.stats()
+
+    def _forget(self, key: str, job: asyncio.Task) -> None:
+        self._jobs.pop(key, None)
+        if not job.cancelled():
+            job.exception()  # Failures reach waiters; nobody may be waiting on this one
+
+    async def _run(self, key: str, puzzle: TimeLockPuzzle) -> str:
+        self._queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+        try:
+            handle = SolverHandle.start(puzzle, self._step)
+            self._handles[key] = handle
+            y = await handle.result()
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._handles.pop(key, None)
+            self._slots.release()
+
+        y_hex = hex(y)[2:]  # remove 0x
+        self._cache.put(key, y_hex)
+        self._solved += 1
+        return y_hex
@@ -0,0 +1,8 @@
+"""Local long-running services."""
+
+from .JsonHttpServer import JsonHttpServer
+from .PuzzleIssuingService import PuzzleIssuingService
+from .ResultCache import ResultCache
+from .SolverService import SolverService
+
+__all__ = ["JsonHttpServer", "PuzzleIssuingService", "ResultCache", "SolverService"]
@@ -26,3 +26,26 @@ class EfficientTimeLockPuzzleSolver:
         phi = rsa.get_phi()
         d = MPC.mod(exp, phi)  # Reduce exponent modulo phi
         return MPC.powmod(puzzle.get_x(), d, puzzle.get_N())
+
+    @staticmethod
+    def solve_with_factors(p: MPZ, q: MPZ, puzzle: TimeLockPuzzle) -> MPZ:
+        """Solve puzzle from the prime factors of N using the Chinese remainder theorem.
+
+        Reduces 2^t modulo p-1 and q-1 with a modular exponentiation instead of materialising
+        2^t, and works with half-size moduli, so it is several times faster than `solve`.
+
+        Args:
+            p: First prime factor of the puzzle modulus
+            q: Second prime factor of the puzzle modulus
+            puzzle: The puzzle to solve
+
+        Returns:
+            The solution y = x^(2^t) mod N
+        """
+        x = puzzle.get_x()
+        t = puzzle.get_t()
+        y_p = MPC.powmod(MPC.mod(x, p), MPC.powmod(TWO, t, p - 1), p)
+        y_q = MPC.powmod(MPC.mod(x, q), MPC.powmod(TWO, t, q - 1), q)
+        # Garner recombination: y = y_q + q * ((y_p - y_q) * q^-1 mod p)
+        h = MPC.mod((y_p - y_q) * MPC.invert(q, p), p)
+        return MPC.mpz(y_q + q * h)
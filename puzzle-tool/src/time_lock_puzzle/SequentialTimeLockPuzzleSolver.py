@@ -1,3 +1,5 @@
+from typing import Iterator, List, Tuple
+
 from ..mpc import MPC
 from ..mpc.types import MPZ
 from .TimeLockPuzzle import TimeLockPuzzle
@@ -31,3 +33,61 @@ class SequentialTimeLockPuzzleSolver:
 
         # Then calculate x^(2^t) mod N in one step
         return MPC.powmod(x, exp, N)
+
+    @staticmethod
+    def solve_in_steps(puzzle: TimeLockPuzzle, step: int) -> Iterator[Tuple[int, MPZ]]:
+        """Solve puzzle by sequential squaring, yielding after every `step` squarings.
+
+        Lets callers observe progress, pause, or stop between steps; the total work is the same
+        as `solve`.
+
+        Args:
+            puzzle: The puzzle to solve
+            step: Number of squarings between yields
+
+        Yields:
+            (squarings done, x^(2^done) mod N); the last item is (t, solution)
+        """
+        value = puzzle.get_x()
+        N = puzzle.get_N()
+        t = int(puzzle.get_t())
+        done = 0
+        while done < t:
+            squarings = min(step, t - done)
+            value = MPC.powmod(value, MPC.pow(TWO, MPC.mpz(squarings)), N)
+            done += squarings
+            yield done, value
+
+    @staticmethod
+    def solve_milestones(puzzle: TimeLockPuzzle, milestones: List[MPZ]) -> List[MPZ]:
+        """Compute x^(2^t_i) mod N for several t_i along one squaring chain.
+
+        Each milestone continues squaring from the previous one, so all outputs together cost
+        as many squarings as the largest milestone alone.
+
+        Args:
+            puzzle: The puzzle providing x, N and the largest allowed milestone t
+            milestones: Ascending positive numbers of squarings, none greater than t
+
+        Returns:
+            The output at each milestone, in the same order
+
+        Raises:
+            ValueError: If milestones is empty, unsorted, or outside 1..t
+        """
+        if not milestones:
+            raise ValueError("milestones must not be empty")
+        if any(a > b for a, b in zip(milestones, milestones[1:])):
+            raise ValueError("milestones must be sorted in ascending order")
+        if milestones[0] < 1 or milestones[-1] > puzzle.get_t():
+            raise ValueError(f"milestones must be between 1 and t={puzzle.get_t()}")
+
+        value = puzzle.get_x()
+        N = puzzle.get_N()
+        done = MPC.mpz(0)
+        outputs = []
+        for milestone in milestones:
+            value = MPC.powmod(value, MPC.pow(TWO, MPC.mpz(milestone) - done), N)
+            done = MPC.mpz(milestone)
+            outputs.append(value)
+        return outputs
@@ -0,0 +1,230 @@
+"""Asyncio handle for a sequential solve running in a worker process."""
+
+import asyncio
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from ..mpc import MPC
+from ..mpc.types import MPZ
+from .SequentialTimeLockPuzzleSolver import SequentialTimeLockPuzzleSolver
+from .TimeLockPuzzle import TimeLockPuzzle
+
+DEFAULT_STEP = 10_000  # Squarings between pause/cancel checks
+DEFAULT_PROGRESS_INTERVAL = 1.0  # Seconds between progress events
+
+# Spawned (not forked) workers: the parent is an event loop that may hold threads and locks
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+@dataclass(frozen=True)
+class SolveProgress:
+    """Progress event of a running solve."""
+
+    squarings_done: int
+    squarings_total: int
+    rate: float  # Squarings per second while running (paused time excluded)
+    eta_seconds: Optional[float]  # None until a rate is known
+    paused: bool
+
+
+class SolverHandle:
+    """Runs `SequentialTimeLockPuzzleSolver` in a worker process and exposes it to asyncio.
+
+    The worker reports over a pipe that is watched by the event loop, so no thread is blocked per
+    solve. Pausing and cancelling take effect at the next step boundary; cancelling ends the
+    worker process cleanly and leaves the host process untouched.
+
+    Example:
+        handle = SolverHandle.start(puzzle)
+        async for event in handle.progress():
+            print(event.squarings_done, event.eta_seconds)
+        y = await handle.result()
+    """
+
+    def __init__(
+        self, puzzle: TimeLockPuzzle, step: int, progress_interval: float
+    ) -> None:
+        """Initialize the handle; use `start` to create and launch one.
+
+        Args:
+            puzzle (TimeLockPuzzle): The puzzle to solve
+            step (int): Squarings between pause/cancel checks
+            progress_interval (float): Seconds between progress events
+        """
+        self._loop = asyncio.get_running_loop()
+        self._total = int(puzzle.get_t())
+        self._result: asyncio.Future = self._loop.create_future()
+        self._subscribers: List[asyncio.Queue] = []
+        self._latest: Optional[SolveProgress] = None
+
+        self._running = _MP_CONTEXT.Event()
+        self._running.set()
+        self._cancelled = _MP_CONTEXT.Event()
+        self._conn, child_conn = _MP_CONTEXT.Pipe(duplex=False)
+        self._process = _MP_CONTEXT.Process(
+            target=_solve_worker,
+            args=(
+                child_conn,
+                int(puzzle.get_x()),
+                self._total,
+                int(puzzle.get_N()),
+                step,
+                progress_interval,
+                self._running,
+                self._cancelled,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()  # Only the worker writes; lets us see EOF if it dies
+        self._loop.add_reader(self._conn.fileno(), self._on_message)
+        self._loop.add_reader(self._process.sentinel, self._on_exit)
+
+    @classmethod
+    def start(
+        cls,
+        puzzle: TimeLockPuzzle,
+        step: int = DEFAULT_STEP,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ) -> "SolverHandle":
+        """Start solving a puzzle in a worker process. Must be called from a running event loop.
+
+        Args:
+            puzzle (TimeLockPuzzle): The puzzle to solve
+            step (int): Squarings between pause/cancel checks
+            progress_interval (float): Seconds between progress events
+
+        Returns:
+            SolverHandle: Handle of the running solve
+        """
+        return cls(puzzle, step, progress_interval)
+
+    async def result(self) -> MPZ:
+        """Wait for the solution y = x^(2^t) mod N.
+
+        Cancelling the awaiting task does not stop the solve; call `cancel()` for that.
+
+        Raises:
+            asyncio.CancelledError: If the solve was cancelled
+        """
+        return await asyncio.shield(self._result)
+
+    async def progress(self) -> AsyncIterator[SolveProgress]:
+        """Stream progress events until the solve finishes (or is cancelled)."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while not self._result.done() or not queue.empty():
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._subscribers.remove(queue)
+
+    @property
+    def latest_progress(self) -> Optional[SolveProgress]:
+        """The most recent progress event, if any."""
+        return self._latest
+
+    @property
+    def done(self) -> bool:
+        return self._result.done()
+
+    def pause(self) -> None:
+        """Stop squaring at the next step boundary until `resume()`."""
+        self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def cancel(self) -> None:
+        """Abandon the solve; the worker exits at the next step boundary."""
+        if self._result.done():
+            return
+        self._cancelled.set()
+        self._running.set()  # Wake a paused worker so it can exit
+        self._result.cancel()
+        self._publish(None)
+
+    # Private Methods
+    # ------------------------------------------------------------------------------
+
+    def _publish(self, event: Optional[SolveProgress]) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def _on_message(self) -> None:
+        try:
+            while self._conn.poll():
+                kind, *payload = self._conn.recv()
+                if kind == "progress":
+                    done, rate, paused = payload
+                    remaining = self._total - done
+                    self._latest = SolveProgress(
+                        squarings_done=done,
+                        squarings_total=self._total,
+                        rate=rate,
+                        eta_seconds=remaining / rate if rate > 0 else None,
+                        paused=paused,
+                    )
+                    self._publish(self._latest)
+                elif kind == "result" and not self._result.done():
+                    self._result.set_result(MPC.mpz(payload[0]))
+                    self._publish(None)
+                elif kind == "error" and not self._result.done():
+                    self._result.set_exception(RuntimeError(payload[0]))
+                    self._publish(None)
+        except EOFError:
+            self._loop.remove_reader(self._conn.fileno())
+
+    def _on_exit(self) -> None:
+        self._loop.remove_reader(self._process.sentinel)
+        self._on_message()  # Drain anything sent just before exiting
+        self._loop.remove_reader(self._conn.fileno())
+        self._process.join()
+        self._conn.close()
+        if not self._result.done():
+            self._result.set_exception(
+                RuntimeError(f"Solver process exited with code {self._process.exitcode}")
+            )
+            self._publish(None)
+
+
+def _solve_worker(
+    conn,
+    x: int,
+    t: int,
+    N: int,
+    step: int,
+    progress_interval: float,
+    running,
+    cancelled,
+) -> None:
+    """Worker process body: squares in steps, honouring pause/cancel between steps."""
+    try:
+        puzzle = TimeLockPuzzle(MPC.mpz(x), MPC.mpz(t), MPC.mpz(N))
+        value = puzzle.get_x()
+        active_seconds = 0.0
+        last_report = 0.0
+        segment_start = time.monotonic()
+        for done, value in SequentialTimeLockPuzzleSolver.solve_in_steps(puzzle, step):
+            now = time.monotonic()
+            if not running.is_set():
+                active_seconds += now - segment_start
+                conn.send(("progress", done, done / max(active_seconds, 1e-9), True))
+                running.wait()
+                segment_start = now = time.monotonic()
+            if cancelled.is_set():
+                return
+            if now - last_report >= progress_interval:
+                rate = done / max(active_seconds + now - segment_start, 1e-9)
+                conn.send(("progress", done, rate, False))
+                last_report = now
+        conn.send(("result", int(value)))
+    except Exception as e:  # pylint: disable=broad-except
+        conn.send(("error", repr(e)))
+    finally:
+        conn.close()
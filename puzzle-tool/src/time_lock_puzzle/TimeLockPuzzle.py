@@ -4,17 +4,19 @@ from ..mpc.types import MPZ
 class TimeLockPuzzle:
     """A time lock puzzle."""
 
-    def __init__(self, x: MPZ, t: MPZ, N: MPZ) -> None:
+    def __init__(self, x: MPZ, t: MPZ, N: MPZ, insecure: bool = False) -> None:
         """Initialize a time lock puzzle.
 
         Args:
             x (MPZ): The input value
             t (MPZ): The time parameter
             N (MPZ): The modulus
+            insecure (bool): Generated in insecure benchmark mode; such puzzles are never saved
         """
         self._x = x
         self._t = t
         self._N = N
+        self._insecure = insecure
 
     def get_x(self) -> MPZ:
         return self._x
@@ -24,3 +26,6 @@ class TimeLockPuzzle:
 
     def get_N(self) -> MPZ:
         return self._N
+
+    def is_insecure(self) -> bool:
+        return self._insecure
@@ -1,6 +1,8 @@
-from typing import List, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 import multiprocessing
+import time
 
+from ..utils.BackgroundPolicy import BackgroundPolicy
 from ..utils.SystemSpecs import SystemSpecs
 from ..mpc import MPC
 from ..mpc.types import MPZ
@@ -13,17 +15,29 @@ from .EfficientTimeLockPuzzleSolver import EfficientTimeLockPuzzleSolver
 class TimeLockPuzzleFactory:
     """Factory for creating time lock puzzles."""
 
-    def __init__(self, bit_size: int, timing_parameter: MPZ) -> None:
+    def __init__(
+        self,
+        bit_size: int,
+        timing_parameter: MPZ,
+        compute_output: bool = True,
+        background_policy: Optional[BackgroundPolicy] = None,
+    ) -> None:
         """Initialize the factory.
 
         Args:
             bit_size (int): Number of bits for RSA parameters
             timing_parameter (MPZ): Time parameter t for puzzles
+            compute_output (bool): Whether to compute the solution y for each puzzle. When False
+                (lazy output mode) y is None and can be derived later from p and q.
+            background_policy (Optional[BackgroundPolicy]): When set, create_puzzles runs its
+                workers within this CPU budget instead of on half the cores at full speed.
         """
         self._bit_size = bit_size
         self._t = timing_parameter
+        self._compute_output = compute_output
+        self._background_policy = background_policy
 
-    def create_puzzle(self) -> Tuple[TimeLockPuzzle, RSA, MPZ]:
+    def create_puzzle(self) -> Tuple[TimeLockPuzzle, RSA, Optional[MPZ]]:
         # Create RSA instance
         rsa_instance = RSA(self._bit_size)
 
@@ -32,42 +46,169 @@ class TimeLockPuzzleFactory:
         x = MPC.mpz_urandomb(rand, self._bit_size)
 
         # Create puzzle directly
-        puzzle = TimeLockPuzzle(x, self._t, rsa_instance.get_N())
+        puzzle = TimeLockPuzzle(
+            x, self._t, rsa_instance.get_N(), insecure=Random.get_insecure_seed() is not None
+        )
+
+        if not self._compute_output:
+            return puzzle, rsa_instance, None
 
         # Get solution using efficient solver
         y = EfficientTimeLockPuzzleSolver.solve(rsa_instance, puzzle)
 
         return puzzle, rsa_instance, y
 
-    def create_puzzles(self, amount: int) -> List[Tuple[TimeLockPuzzle, RSA, MPZ]]:
+    def create_puzzles(self, amount: int) -> List[Tuple[TimeLockPuzzle, RSA, Optional[MPZ]]]:
         # Create parameters for each puzzle
-        puzzle_params = [(self._bit_size, self._t) for _ in range(amount)]
+        puzzle_params = [(self._bit_size, self._t, self._compute_output) for _ in range(amount)]
 
-        num_workers = SystemSpecs.get_num_parallel_processes()
+        return self._map_parallel(TimeLockPuzzleFactory._create_puzzle_parallel, puzzle_params)
 
-        # Create puzzles in parallel using process pool
-        with multiprocessing.Pool(num_workers) as pool:
-            puzzles = pool.map(
-                TimeLockPuzzleFactory._create_puzzle_parallel, puzzle_params
+    def create_tiered_puzzle(
+        self, milestones: List[MPZ]
+    ) -> Tuple[TimeLockPuzzle, RSA, List[MPZ]]:
+        """Create a puzzle with an output for each of several delay tiers.
+
+        The puzzle's t is the largest milestone; a solver squaring towards it passes every
+        smaller milestone on the way (see SequentialTimeLockPuzzleSolver.solve_milestones).
+        Outputs are always computed here, whatever compute_output was set to.
+
+        Args:
+            milestones (List[MPZ]): Ascending positive numbers of squarings, one per tier
+
+        Returns:
+            Tuple[TimeLockPuzzle, RSA, List[MPZ]]: The puzzle, RSA instance, and the solution
+            x^(2^t_i) mod N for each milestone t_i
+        """
+        if not milestones or any(a > b for a, b in zip(milestones, milestones[1:])):
+            raise ValueError("milestones must be a non-empty ascending list")
+        if milestones[0] < 1:
+            raise ValueError("milestones must be positive")
+
+        rsa_instance = RSA(self._bit_size)
+        rand = Random.get_random(self._bit_size)
+        x = MPC.mpz_urandomb(rand, self._bit_size)
+        N = rsa_instance.get_N()
+        puzzle = TimeLockPuzzle(
+            x, MPC.mpz(milestones[-1]), N, insecure=Random.get_insecure_seed() is not None
+        )
+
+        # Trapdoor for each tier: a couple of half-size modexps, independent of t_i
+        p, q = rsa_instance.get_p(), rsa_instance.get_q()
+        outputs = [
+            EfficientTimeLockPuzzleSolver.solve_with_factors(
+                p, q, TimeLockPuzzle(x, MPC.mpz(milestone), N)
             )
+            for milestone in milestones
+        ]
+        return puzzle, rsa_instance, outputs
 
-        return puzzles
+    def create_tiered_puzzles(
+        self, amount: int, milestones: List[MPZ]
+    ) -> List[Tuple[TimeLockPuzzle, RSA, List[MPZ]]]:
+        """Create several tiered puzzles in parallel (see create_tiered_puzzle)."""
+        tiered_params = [(self._bit_size, list(milestones)) for _ in range(amount)]
+
+        return self._map_parallel(
+            TimeLockPuzzleFactory._create_tiered_puzzle_parallel, tiered_params
+        )
 
     # Private Methods
     # ------------------------------------------------------------------------------
 
+    def _map_parallel(self, helper: Callable[[Any], Any], params: List[Any]) -> List[Any]:
+        """Run a module-level helper over params in a process pool.
+
+        In insecure benchmark mode (see Random.enable_insecure_benchmark_mode) task i draws from
+        its own stream of the benchmark seed, so results do not depend on which worker runs it.
+
+        Args:
+            helper (Callable[[Any], Any]): Picklable function creating one puzzle
+            params (List[Any]): One parameter tuple per puzzle
+
+        Returns:
+            List[Any]: The helper's results, in order
+        """
+        policy = self._background_policy
+        seed = Random.get_insecure_seed()
+        tasks = [
+            (helper, task_params, policy, None if seed is None else (seed, f"task-{index}"))
+            for index, task_params in enumerate(params)
+        ]
+
+        if policy is not None:
+            # Niced, pinned, duty-cycled workers; one task per dispatch so throttling stays smooth
+            with multiprocessing.Pool(
+                policy.get_num_workers(), initializer=policy.apply_to_current_process
+            ) as pool:
+                return pool.map(TimeLockPuzzleFactory._run_task, tasks, chunksize=1)
+
+        num_workers = SystemSpecs.get_num_parallel_processes()
+
+        # Create puzzles in parallel using process pool
+        with multiprocessing.Pool(num_workers) as pool:
+            puzzles = pool.map(TimeLockPuzzleFactory._run_task, tasks)
+
+        return puzzles
+
     @staticmethod
     def _create_puzzle_parallel(
-        puzzle_params: Tuple[int, MPZ],
-    ) -> Tuple[TimeLockPuzzle, RSA, MPZ]:
+        puzzle_params: Tuple[int, MPZ, bool],
+    ) -> Tuple[TimeLockPuzzle, RSA, Optional[MPZ]]:
         """Helper method to create a single puzzle tuple for multiprocessing.
 
         Args:
-            puzzle_params (Tuple[int, MPZ]): Tuple containing (bit_size, timing_parameter)
+            puzzle_params (Tuple[int, MPZ, bool]): Tuple containing (bit_size, timing_parameter,
+                compute_output)
 
         Returns:
-            Tuple[TimeLockPuzzle, RSA, MPZ]: A tuple containing the puzzle, RSA instance, and solution
+            Tuple[TimeLockPuzzle, RSA, Optional[MPZ]]: A tuple containing the puzzle, RSA instance,
+            and solution (None in lazy output mode)
         """
-        bit_size, t = puzzle_params
-        factory = TimeLockPuzzleFactory(bit_size, t)
+        bit_size, t, compute_output = puzzle_params
+        factory = TimeLockPuzzleFactory(bit_size, t, compute_output)
         return factory.create_puzzle()
+
+    @staticmethod
+    def _create_tiered_puzzle_parallel(
+        tiered_params: Tuple[int, List[MPZ]],
+    ) -> Tuple[TimeLockPuzzle, RSA, List[MPZ]]:
+        """Helper method to create a single tiered puzzle for multiprocessing.
+
+        Args:
+            tiered_params (Tuple[int, List[MPZ]]): Tuple containing (bit_size, milestones)
+
+        Returns:
+            Tuple[TimeLockPuzzle, RSA, List[MPZ]]: Same as create_tiered_puzzle
+        """
+        bit_size, milestones = tiered_params
+        factory = TimeLockPuzzleFactory(bit_size, milestones[-1])
+        return factory.create_tiered_puzzle(milestones)
+
+    @staticmethod
+    def _run_task(
+        task: Tuple[
+            Callable[[Any], Any], Any, Optional[BackgroundPolicy], Optional[Tuple[int, str]]
+        ],
+    ) -> Any:
+        """Run a puzzle helper in a pool worker.
+
+        Args:
+            task: Helper, its parameters, the background policy (if any; the worker sleeps as it
+                requires afterwards) and the benchmark (seed, stream) (if any)
+
+        Returns:
+            Any: The helper's result
+        """
+        helper, params, policy, benchmark_stream = task
+        if benchmark_stream is not None:
+            Random.enable_insecure_benchmark_mode(*benchmark_stream)
+        try:
+            start_cpu = time.process_time()
+            result = helper(params)
+            if policy is not None:
+                policy.throttle(time.process_time() - start_cpu)
+            return result
+        finally:
+            if benchmark_stream is not None:
+                Random.disable_insecure_benchmark_mode()
@@ -4,10 +4,13 @@ from .TimeLockPuzzle import TimeLockPuzzle
 from .TimeLockPuzzleFactory import TimeLockPuzzleFactory
 from .EfficientTimeLockPuzzleSolver import EfficientTimeLockPuzzleSolver
 from .SequentialTimeLockPuzzleSolver import SequentialTimeLockPuzzleSolver
+from .SolverHandle import SolverHandle, SolveProgress
 
 __all__ = [
     "TimeLockPuzzle",
     "TimeLockPuzzleFactory",
     "EfficientTimeLockPuzzleSolver",
     "SequentialTimeLockPuzzleSolver",
+    "SolverHandle",
+    "SolveProgress",
 ]
@@ -0,0 +1,93 @@
+"""CPU budget for generating puzzles in the background of latency-sensitive processes."""
+
+import math
+import os
+import time
+from typing import List
+
+from .SystemSpecs import SystemSpecs
+
+
+class BackgroundPolicy:
+    """Limits how much of the node background generation may use.
+
+    Enforced in three layers: worker processes are reniced and pinned away from a set of cores
+    reserved for the solver (and the orchestrator/Postgres), each worker sleeps between tasks so
+    the pool as a whole stays within the CPU budget, and workers pause while the rest of the node
+    is busy.
+    """
+
+    def __init__(
+        self,
+        cpu_budget: float = 0.4,
+        reserved_cores: int = 1,
+        nice: int = 19,
+        max_load: float = 0.8,
+        backoff_seconds: float = 1.0,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            cpu_budget (float): Fraction of the node's CPUs generation may use (0 < budget <= 1)
+            reserved_cores (int): Number of cores (the lowest-numbered available ones) kept free
+                of generation workers
+            nice (int): Niceness increment applied to worker processes
+            max_load (float): Load from other processes, as a fraction of the node's CPUs, above
+                which workers pause between tasks
+            backoff_seconds (float): Pause length while the node is above max_load
+        """
+        if not 0 < cpu_budget <= 1:
+            raise ValueError("cpu_budget must be in (0, 1]")
+        self._nice = nice
+        self._max_load = max_load
+        self._backoff_seconds = backoff_seconds
+
+        # Sized once, from the parent's view of the node: a pinned worker sees only its own
+        # affinity set and would otherwise compute a different budget and reserved set
+        cores = SystemSpecs.get_available_cores()
+        self._num_cpus = len(cores)
+        # Always leave at least one core for the workers
+        self._reserved = cores[: min(reserved_cores, len(cores) - 1)]
+        self._worker_cores = [core for core in cores if core not in self._reserved]
+        budget_cpus = cpu_budget * self._num_cpus
+        self._num_workers = max(1, min(len(self._worker_cores), math.ceil(budget_cpus)))
+        self._duty_cycle = min(1.0, budget_cpus / self._num_workers)
+
+    def get_reserved_cores(self) -> List[int]:
+        """Cores kept free of generation workers (e.g. for pinning the sequential solver)."""
+        return list(self._reserved)
+
+    def get_worker_cores(self) -> List[int]:
+        """Cores generation workers are pinned to."""
+        return list(self._worker_cores)
+
+    def get_num_workers(self) -> int:
+        """Number of worker processes: enough to spend the budget, at most one per worker core."""
+        return self._num_workers
+
+    def get_duty_cycle(self) -> float:
+        """Fraction of the time each worker may be busy so the pool stays within budget."""
+        return self._duty_cycle
+
+    def apply_to_current_process(self) -> None:
+        """Renice the calling process and pin it to the worker cores (use as a pool initializer)."""
+        if self._nice:
+            os.nice(self._nice)
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, self.get_worker_cores())
+
+    def throttle(self, busy_cpu_seconds: float) -> None:
+        """Sleep after a task that used `busy_cpu_seconds` of CPU to honour the duty cycle, then
+        keep pausing while other processes load the node above `max_load`.
+
+        Args:
+            busy_cpu_seconds (float): CPU time the worker just spent on a task
+        """
+        duty = self.get_duty_cycle()
+        if duty < 1.0:
+            time.sleep(busy_cpu_seconds * (1 - duty) / duty)
+
+        own_load = self._num_workers * duty
+        while (SystemSpecs.get_load() - own_load) / self._num_cpus > self._max_load:
+            time.sleep(self._backoff_seconds)
+            own_load = 0  # Paused workers no longer count towards the load
@@ -1,6 +1,8 @@
 """Utility class for system specifications and resource management."""
 
 import multiprocessing
+import os
+from typing import List
 
 
 class SystemSpecs:
@@ -18,3 +20,28 @@ class SystemSpecs:
         """
         parallelization_denominator = 2 # if cpu has 16 cores and parallelization denominator is 2 then this codebase will use 8 cores
         return multiprocessing.cpu_count() // parallelization_denominator or 1 # default to 1 if only 1 core available
+
+    @staticmethod
+    def get_available_cores() -> List[int]:
+        """
+        List the CPU cores this process may run on.
+
+        Returns:
+            List[int]: Sorted core ids (honours cgroup/taskset affinity where supported)
+        """
+        if hasattr(os, "sched_getaffinity"):
+            return sorted(os.sched_getaffinity(0))
+        return list(range(multiprocessing.cpu_count()))
+
+    @staticmethod
+    def get_load() -> float:
+        """
+        Get the one-minute system load average.
+
+        Returns:
+            float: Average number of runnable processes, or 0.0 where unsupported
+        """
+        try:
+            return os.getloadavg()[0]
+        except (AttributeError, OSError):
+            return 0.0
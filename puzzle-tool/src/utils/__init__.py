@@ -1,5 +1,6 @@
 """Utility modules for the puzzle generator."""
 
 from .SystemSpecs import SystemSpecs
+from .BackgroundPolicy import BackgroundPolicy
 
-__all__ = ["SystemSpecs"]
+__all__ = ["SystemSpecs", "BackgroundPolicy"]
@@ -0,0 +1,114 @@
+"""Tests that puzzles from insecure benchmark mode never reach the database."""
+
+import asyncio
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from src.converters.rsa_converter import RSAConverter
+from src.converters.time_lock_puzzle_converter import TimeLockPuzzleConverter
+from src.database.DatabaseService import DatabaseService
+from src.database.GenerationJobService import GenerationJobService
+from src.database.database import session_scope, update_instance
+from src.mpc import MPC
+from src.random import Random
+from src.service.PuzzleIssuingService import PuzzleIssuingService
+from src.time_lock_puzzle.TimeLockPuzzleFactory import TimeLockPuzzleFactory
+
+issuing_module = sys.modules[PuzzleIssuingService.__module__]
+
+
+def to_entities(puzzles):
+    entities = []
+    for puzzle, rsa, y in puzzles:
+        rsa_entity = RSAConverter.to_entity(rsa)
+        entities += [rsa_entity, TimeLockPuzzleConverter.to_entity(puzzle, rsa_entity.id, y)]
+    return entities
+
+
+def benchmark_puzzles(amount):
+    Random.enable_insecure_benchmark_mode(7)
+    try:
+        return TimeLockPuzzleFactory(256, MPC.mpz(100)).create_puzzles(amount)
+    finally:
+        Random.disable_insecure_benchmark_mode()
+
+
+def stored():
+    with session_scope() as session:
+        return (
+            session.execute(text("SELECT count(*) FROM rsa_keys")).scalar(),
+            session.execute(text("SELECT count(*) FROM time_lock_puzzles")).scalar(),
+        )
+
+
+def test_saving_is_refused_while_the_mode_is_enabled(add_puzzles):
+    Random.enable_insecure_benchmark_mode(7)
+    try:
+        with pytest.raises(RuntimeError):
+            add_puzzles(1)
+    finally:
+        Random.disable_insecure_benchmark_mode()
+
+    assert stored() == (0, 0)
+
+
+def test_benchmark_puzzles_are_refused_after_the_mode_is_disabled(database):
+    entities = to_entities(benchmark_puzzles(2))  # Generated in pool workers
+    assert all(entity.insecure_benchmark for entity in entities)
+
+    with pytest.raises(RuntimeError):
+        DatabaseService.save_many(entities)
+    with pytest.raises(RuntimeError):
+        DatabaseService.save_partitioned(entities, writers=1)
+    with pytest.raises(RuntimeError):
+        entities[0].save()
+    with pytest.raises(RuntimeError):
+        update_instance(entities[1])
+    GenerationJobService.enqueue(2, 2)
+    job = GenerationJobService.lease("worker", 60)
+    with pytest.raises(RuntimeError):
+        GenerationJobService.complete(job.id, "worker", entities)
+
+    assert stored() == (0, 0)
+
+
+def test_secure_puzzles_are_saved(database):
+    puzzle = TimeLockPuzzleFactory(256, MPC.mpz(100)).create_puzzle()
+
+    DatabaseService.save_many(to_entities([puzzle]))
+
+    assert stored() == (1, 1)
+
+
+def benchmark_create_puzzle(bit_size, t):
+    Random.enable_insecure_benchmark_mode(7)
+    try:
+        return TimeLockPuzzleFactory(bit_size, t).create_puzzle()
+    finally:
+        Random.disable_insecure_benchmark_mode()
+
+
+async def wait_for_failures(service, failures):
+    while service.stats()["refill_failures"] < failures:
+        await asyncio.sleep(0.05)
+
+
+def test_the_issuing_service_never_persists_or_issues_benchmark_puzzles(database, monkeypatch):
+    # Patched before the worker process is forked, so the worker sees it
+    monkeypatch.setattr(issuing_module, "_create_puzzle", benchmark_create_puzzle)
+
+    async def run():
+        service = PuzzleIssuingService(256, MPC.mpz(100), capacity=1, persist_interval=0.05)
+        await service.start()
+        await asyncio.wait_for(wait_for_failures(service, 2), 30)
+        await asyncio.sleep(0.2)
+        stats = service.stats()
+        await service.stop()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats["buffer_depth"] == 0
+    assert stored() == (0, 0)
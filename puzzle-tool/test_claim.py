@@ -0,0 +1,80 @@
+"""Tests for DatabaseService.claim on SQLite."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from src.database.DatabaseService import DatabaseService
+from src.database.database import session_scope
+
+
+def assigned_request_ids():
+    with session_scope() as session:
+        return dict(
+            session.execute(
+                text("SELECT id, request_id FROM time_lock_puzzles WHERE request_id IS NOT NULL")
+            ).all()
+        )
+
+
+def test_claim_assigns_one_distinct_puzzle_per_request(add_puzzles):
+    add_puzzles(5)
+
+    claimed = DatabaseService.claim(["a", "b", "c"])
+
+    assert set(claimed) == {"a", "b", "c"}
+    assert len(set(claimed.values())) == 3
+    assert assigned_request_ids() == {
+        puzzle_id: request_id for request_id, puzzle_id in claimed.items()
+    }
+
+
+def test_claim_deduplicates_request_ids(add_puzzles):
+    add_puzzles(5)
+
+    claimed = DatabaseService.claim(["a", "a", "b", "a"])
+
+    assert set(claimed) == {"a", "b"}
+    assert len(assigned_request_ids()) == 2
+
+
+def test_claim_returns_earlier_assignments_unchanged(add_puzzles):
+    add_puzzles(5)
+    first = DatabaseService.claim(["a", "b"])
+
+    second = DatabaseService.claim(["b", "a", "c"])
+
+    assert second["a"] == first["a"]
+    assert second["b"] == first["b"]
+    assert "c" in second
+    assert len(assigned_request_ids()) == 3
+
+
+def test_claim_serves_only_the_first_requests_when_the_pool_runs_short(add_puzzles):
+    add_puzzles(2)
+
+    claimed = DatabaseService.claim(["a", "b", "c", "d"])
+
+    assert set(claimed) == {"a", "b"}
+    assert DatabaseService.claim(["c"]) == {}
+
+
+def test_claim_of_nothing(add_puzzles):
+    add_puzzles(1)
+
+    assert DatabaseService.claim([]) == {}
+    assert assigned_request_ids() == {}
+
+
+def test_request_id_cannot_own_two_puzzles(add_puzzles):
+    add_puzzles(2)
+    DatabaseService.claim(["a"])
+
+    with pytest.raises(IntegrityError):
+        with session_scope() as session:
+            session.execute(
+                text(
+                    "UPDATE time_lock_puzzles SET request_id = 'a' "
+                    "WHERE id = (SELECT id FROM time_lock_puzzles WHERE request_id IS NULL)"
+                )
+            )
@@ -0,0 +1,157 @@
+"""Tests for GenerationJobService leases on SQLite."""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, true, update
+
+import generate
+import src.database.GenerationJobService as generation_jobs
+from src.database.GenerationJobService import GenerationJobService, LeaseHeartbeat
+from src.database.benchmark_writers import synthetic_entities
+from src.database.database import session_scope
+from src.database.entity import GenerationJobEntity, TimeLockPuzzleEntity
+from src.database.entity.GenerationJobEntity import JOB_DONE, JOB_LEASED
+
+
+def expire_lease(job_id):
+    with session_scope() as session:
+        session.execute(
+            update(GenerationJobEntity)
+            .where(GenerationJobEntity.id == job_id)
+            .values(lease_expires_at=datetime(2000, 1, 1))
+        )
+
+
+def job(job_id):
+    with session_scope() as session:
+        return session.get(GenerationJobEntity, job_id)
+
+
+def puzzle_count():
+    with session_scope() as session:
+        return session.execute(select(func.count()).select_from(TimeLockPuzzleEntity)).scalar()
+
+
+def test_enqueue_splits_the_target_into_chunks(database):
+    batch_id = GenerationJobService.enqueue(25, 10)
+
+    assert GenerationJobService.progress(batch_id) == {"pending": 25, "leased": 0, "done": 0}
+    with session_scope() as session:
+        amounts = session.execute(select(GenerationJobEntity.amount)).scalars().all()
+    assert sorted(amounts) == [5, 10, 10]
+
+
+def test_a_job_is_leased_by_one_worker_at_a_time(database):
+    GenerationJobService.enqueue(2, 1)
+
+    first = GenerationJobService.lease("a", 60)
+    second = GenerationJobService.lease("b", 60)
+
+    assert {first.lease_owner, second.lease_owner} == {"a", "b"}
+    assert first.id != second.id
+    assert GenerationJobService.lease("c", 60) is None
+
+
+def test_lease_is_a_compare_and_set_on_the_job_row(database, monkeypatch):
+    GenerationJobService.enqueue(1, 1)
+    leased = GenerationJobService.lease("a", 60)
+
+    # Let the candidate query return the job as if it was read just before "a" leased it; only
+    # the conditional update stands between "b" and a second lease of the same job
+    calls = []
+
+    def stale_candidates(now):
+        calls.append(now)
+        return true() if len(calls) == 1 else real_leasable(now)
+
+    real_leasable = generation_jobs._leasable
+    monkeypatch.setattr(generation_jobs, "_leasable", stale_candidates)
+
+    assert GenerationJobService.lease("b", 60) is None
+    assert len(calls) == 2
+    assert job(leased.id).lease_owner == "a"
+    assert job(leased.id).attempts == 1
+
+
+def test_an_expired_lease_is_taken_over(database):
+    GenerationJobService.enqueue(1, 1)
+    leased = GenerationJobService.lease("a", 60)
+    expire_lease(leased.id)
+
+    taken = GenerationJobService.lease("b", 60)
+
+    assert taken.id == leased.id
+    assert taken.lease_owner == "b"
+    assert taken.status == JOB_LEASED
+    assert taken.attempts == 2
+    assert taken.lease_expires_at > datetime.utcnow() + timedelta(seconds=30)
+
+
+def test_heartbeat_fails_once_the_lease_was_taken_over(database):
+    GenerationJobService.enqueue(1, 1)
+    leased = GenerationJobService.lease("a", 60)
+    assert GenerationJobService.heartbeat(leased.id, "a", 60)
+
+    expire_lease(leased.id)
+    GenerationJobService.lease("b", 60)
+
+    assert not GenerationJobService.heartbeat(leased.id, "a", 60)
+    assert GenerationJobService.heartbeat(leased.id, "b", 60)
+
+
+def test_lease_heartbeat_thread_reports_a_lost_lease(database):
+    GenerationJobService.enqueue(1, 1)
+    leased = GenerationJobService.lease("a", 0.3)
+    heartbeat = LeaseHeartbeat(leased.id, "a", 0.3)
+    heartbeat.start()
+    expire_lease(leased.id)
+    GenerationJobService.lease("b", 60)
+
+    deadline = time.time() + 5
+    while not heartbeat.lost and time.time() < deadline:
+        time.sleep(0.05)
+    heartbeat.stop()
+
+    assert heartbeat.lost
+
+
+def test_complete_refuses_a_worker_that_lost_its_lease(database):
+    GenerationJobService.enqueue(1, 1)
+    leased = GenerationJobService.lease("a", 60)
+    expire_lease(leased.id)
+    GenerationJobService.lease("b", 60)
+
+    assert not GenerationJobService.complete(leased.id, "a", synthetic_entities(1))
+    assert puzzle_count() == 0
+    assert job(leased.id).status == JOB_LEASED
+
+    assert GenerationJobService.complete(leased.id, "b", synthetic_entities(1))
+    assert puzzle_count() == 1
+    assert job(leased.id).status == JOB_DONE
+    assert not GenerationJobService.complete(leased.id, "b", synthetic_entities(1))
+    assert puzzle_count() == 1
+
+
+@pytest.mark.parametrize("target, chunk_size", [(0, 10), (-5, 10), (10, 0), (10, -1)])
+def test_enqueue_rejects_non_positive_sizes(database, target, chunk_size):
+    with pytest.raises(ValueError):
+        GenerationJobService.enqueue(target, chunk_size)
+    assert GenerationJobService.progress() == {"pending": 0, "leased": 0, "done": 0}
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["0", "--enqueue"],
+        ["-3", "--enqueue"],
+        ["10", "--enqueue", "--chunk-size", "0"],
+        ["10", "--enqueue", "--chunk-size", "-2"],
+    ],
+)
+def test_generate_rejects_non_positive_counts_and_chunk_sizes(monkeypatch, argv):
+    monkeypatch.setattr(sys, "argv", ["generate.py", *argv])
+    with pytest.raises(SystemExit):
+        generate.parse_args()
@@ -0,0 +1,85 @@
+"""Tests for lazy output mode on SQLite."""
+
+import pytest
+from sqlalchemy import text
+
+from generate import TimeLockPuzzleService
+from src.database.DatabaseService import DatabaseService
+from src.database.LazyOutputResolver import LazyOutputResolver
+from src.database.database import session_scope
+from src.database.entity import TimeLockPuzzleEntity
+from src.database.entity.TimeLockPuzzleEntity import LAZY_REQUEST_PREFIX
+from src.mpc import MPC
+
+T = 100
+
+
+@pytest.fixture(autouse=True)
+def nullable_y(monkeypatch):
+    """Create the tables as with LAZY_OUTPUT=true (set before the `database` fixture runs)."""
+    monkeypatch.setattr(TimeLockPuzzleEntity.__table__.c.y, "nullable", True)
+
+
+def add_lazy_puzzles(count):
+    service = TimeLockPuzzleService(256, MPC.mpz(T), lazy_output=True)
+    entities = service.convert_to_entities(service.generate_puzzles(count))
+    DatabaseService.save_many(entities)
+    return [entity for entity in entities if isinstance(entity, TimeLockPuzzleEntity)]
+
+
+def rows():
+    with session_scope() as session:
+        return {
+            puzzle_id: (x, y, modulus, request_id)
+            for puzzle_id, x, y, modulus, request_id in session.execute(
+                text("SELECT id, x, y, modulus, request_id FROM time_lock_puzzles")
+            )
+        }
+
+
+def expected_y(x_hex, N_hex):
+    return hex(pow(int(x_hex, 16), 2**T, int(N_hex, 16)))[2:]
+
+
+def test_lazy_puzzles_are_held_out_of_the_pool(database):
+    puzzles = add_lazy_puzzles(2)
+
+    assert {puzzle_id: row[3] for puzzle_id, row in rows().items()} == {
+        puzzle.id: f"{LAZY_REQUEST_PREFIX}{puzzle.id}" for puzzle in puzzles
+    }
+    assert DatabaseService.pool_stats()["unassigned"] == 0
+    assert DatabaseService.claim(["request"]) == {}
+
+
+def test_write_back_stores_y_and_releases_the_puzzle(database):
+    held, other = add_lazy_puzzles(2)
+
+    y_hex = LazyOutputResolver(write_back=True).get_output(held.id)
+
+    x_hex, stored_y, N_hex, request_id = rows()[held.id]
+    assert y_hex == stored_y == expected_y(x_hex, N_hex)
+    assert request_id is None
+    assert rows()[other.id][1] is None
+    assert DatabaseService.claim(["request"]) == {"request": held.id}
+
+
+def test_read_without_write_back_keeps_the_puzzle_held(database):
+    (held,) = add_lazy_puzzles(1)
+
+    LazyOutputResolver().get_output(held.id)
+
+    _, y_hex, _, request_id = rows()[held.id]
+    assert y_hex is None
+    assert request_id == f"{LAZY_REQUEST_PREFIX}{held.id}"
+
+
+def test_release_held_writes_back_every_output(database):
+    add_lazy_puzzles(3)
+
+    assert LazyOutputResolver().release_held(batch_size=2) == 3
+
+    for x_hex, y_hex, N_hex, request_id in rows().values():
+        assert y_hex == expected_y(x_hex, N_hex)
+        assert request_id is None
+    assert DatabaseService.pool_stats()["unassigned"] == 3
+    assert LazyOutputResolver().release_held() == 0
@@ -0,0 +1,57 @@
+"""Tests for multi-milestone solving and tiered puzzles."""
+
+import sys
+
+import pytest
+
+import solve
+from src.mpc import MPC
+from src.time_lock_puzzle.EfficientTimeLockPuzzleSolver import EfficientTimeLockPuzzleSolver
+from src.time_lock_puzzle.SequentialTimeLockPuzzleSolver import SequentialTimeLockPuzzleSolver
+from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
+from src.time_lock_puzzle.TimeLockPuzzleFactory import TimeLockPuzzleFactory
+
+P, Q = MPC.mpz(1_000_003), MPC.mpz(1_000_033)
+
+
+def puzzle(t):
+    return TimeLockPuzzle(MPC.mpz(5), MPC.mpz(t), P * Q)
+
+
+def test_milestones_match_the_trapdoor():
+    outputs = SequentialTimeLockPuzzleSolver.solve_milestones(puzzle(500), [1, 20, 20, 500])
+
+    assert outputs == [
+        EfficientTimeLockPuzzleSolver.solve_with_factors(P, Q, puzzle(t)) for t in (1, 20, 20, 500)
+    ]
+
+
+@pytest.mark.parametrize("milestones", [[], [30, 20], [0, 20], [-1, 20], [20, 501]])
+def test_invalid_milestones_are_rejected(milestones):
+    with pytest.raises(ValueError):
+        SequentialTimeLockPuzzleSolver.solve_milestones(puzzle(500), milestones)
+
+
+def test_tiered_puzzle_outputs_one_solution_per_milestone():
+    tiered, rsa, outputs = TimeLockPuzzleFactory(256, MPC.mpz(1)).create_tiered_puzzle([10, 40])
+
+    assert tiered.get_t() == 40
+    assert outputs == SequentialTimeLockPuzzleSolver.solve_milestones(tiered, [10, 40])
+    with pytest.raises(ValueError):
+        TimeLockPuzzleFactory(256, MPC.mpz(1)).create_tiered_puzzle([0, 40])
+
+
+def parse(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["solve.py", "5", "100", "ff", *argv])
+    return solve.parse_args()
+
+
+def test_solve_adds_t_to_the_milestones(monkeypatch):
+    assert parse(monkeypatch, "--milestones", "50,10,50").milestones == [10, 50, 100]
+    assert parse(monkeypatch, "--milestones", "100").milestones == [100]
+
+
+@pytest.mark.parametrize("milestones", ["", ",", "101", "0", "-5", "10,x"])
+def test_solve_rejects_invalid_milestones(monkeypatch, milestones):
+    with pytest.raises(SystemExit):
+        parse(monkeypatch, f"--milestones={milestones}")
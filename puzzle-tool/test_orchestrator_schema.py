@@ -0,0 +1,64 @@
+"""Tests against the tables as the orchestrator creates them (db_tools.ts setupDatabase).
+
+The orchestrator runs `generate.py N` without initialize_db, so saving must not need anything
+this tool would add to the schema.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.database.DatabaseService import DatabaseService
+from src.database.benchmark_writers import synthetic_entities
+from src.database.database import session_scope
+
+# setupDatabase's DDL, with the UUID columns as TEXT for SQLite
+ORCHESTRATOR_TABLES = [
+    """
+    CREATE TABLE rsa_keys (
+        id TEXT PRIMARY KEY,
+        p TEXT NOT NULL,
+        q TEXT NOT NULL,
+        modulus TEXT NOT NULL UNIQUE,
+        phi TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE time_lock_puzzles (
+        id TEXT PRIMARY KEY,
+        x TEXT NOT NULL,
+        y TEXT NOT NULL,
+        t TEXT NOT NULL,
+        modulus TEXT NOT NULL,
+        request_id TEXT NULL,
+        rsa_id TEXT NOT NULL UNIQUE,
+        detected_completed TIMESTAMP NULL,
+        FOREIGN KEY (rsa_id) REFERENCES rsa_keys(id) ON DELETE CASCADE
+    )
+    """,
+]
+
+
+@pytest.fixture
+def orchestrator_database(tmp_path, monkeypatch):
+    from src.database import database as database_module
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'orchestrator.db'}")
+    monkeypatch.setattr(database_module, "_engine", engine)
+    with engine.begin() as connection:
+        for statement in ORCHESTRATOR_TABLES:
+            connection.execute(text(statement))
+    yield engine
+    engine.dispose()
+
+
+def test_save_and_claim_on_the_orchestrator_schema(orchestrator_database):
+    DatabaseService.save_many(synthetic_entities(3))
+
+    claimed = DatabaseService.claim(["a"])
+
+    with session_scope() as session:
+        counts = session.execute(
+            text("SELECT count(*), count(request_id) FROM time_lock_puzzles")
+        ).one()
+    assert tuple(counts) == (3, 1)
+    assert set(claimed) == {"a"}
@@ -0,0 +1,62 @@
+"""Tests for saving over several writer processes on SQLite."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from src.database.DatabaseService import DatabaseService
+from src.database.benchmark_writers import synthetic_entities
+from src.database.database import session_scope
+from src.database.entity import TimeLockPuzzleEntity
+
+
+def stored():
+    with session_scope() as session:
+        return (
+            session.execute(text("SELECT count(*) FROM rsa_keys")).scalar(),
+            session.execute(text("SELECT count(*) FROM time_lock_puzzles")).scalar(),
+        )
+
+
+def orphaned_keys():
+    with session_scope() as session:
+        return session.execute(
+            text(
+                "SELECT count(*) FROM rsa_keys "
+                "WHERE id NOT IN (SELECT rsa_id FROM time_lock_puzzles)"
+            )
+        ).scalar()
+
+
+def test_saves_every_pair_over_all_writers(database):
+    stats = DatabaseService.save_partitioned(synthetic_entities(20), writers=3, batch_size=5)
+
+    assert stored() == (20, 20)
+    assert [writer.writer for writer in stats] == [0, 1, 2]
+    assert sum(writer.rows for writer in stats) == 40
+    for writer in stats:
+        # 5 entities fit two whole pairs; the fifth would split a pair
+        pairs = writer.rows // 2
+        assert writer.rows % 2 == 0
+        assert writer.commits == -(-pairs // 2)
+        assert len(writer.commit_latencies) == writer.commits
+
+
+def test_a_batch_smaller_than_a_pair_still_commits_whole_pairs(database):
+    stats = DatabaseService.save_partitioned(synthetic_entities(3), writers=1, batch_size=1)
+
+    assert stored() == (3, 3)
+    assert stats[0].commits == 3
+
+
+def test_a_failed_batch_leaves_no_key_without_its_puzzle(database):
+    entities = synthetic_entities(4)
+    bad = entities[3]  # Second pair's puzzle; with 3-entity batches cut by count, its key would
+    assert isinstance(bad, TimeLockPuzzleEntity)  # commit in the first batch without it
+    bad.x = None
+
+    with pytest.raises(IntegrityError):
+        DatabaseService.save_partitioned(entities, writers=1, batch_size=3)
+
+    assert stored() == (1, 1)
+    assert orphaned_keys() == 0
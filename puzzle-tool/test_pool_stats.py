@@ -0,0 +1,96 @@
+"""Tests that the pool_stats counters track time_lock_puzzles on SQLite."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from src.database.DatabaseService import DatabaseService
+from src.database.database import session_scope
+from src.database.pool_stats import install_pool_stats
+from src.database.purge_completed import purge_completed
+
+
+def counted():
+    """The pool as a full COUNT(*) sees it."""
+    with session_scope() as session:
+        total, unassigned = session.execute(
+            text(
+                "SELECT count(*), coalesce(sum(request_id IS NULL), 0) FROM time_lock_puzzles"
+            )
+        ).one()
+    return {"total": total, "unassigned": unassigned, "assigned": total - unassigned}
+
+
+def complete(request_ids, days_ago):
+    with session_scope() as session:
+        for request_id in request_ids:
+            session.execute(
+                text(
+                    "UPDATE time_lock_puzzles SET detected_completed = :completed "
+                    "WHERE request_id = :request_id"
+                ),
+                {
+                    "completed": datetime.utcnow() - timedelta(days=days_ago),
+                    "request_id": request_id,
+                },
+            )
+
+
+def test_counters_start_empty(database):
+    assert DatabaseService.pool_stats() == {"total": 0, "unassigned": 0, "assigned": 0}
+    assert DatabaseService.pool_stats() == counted()
+
+
+def test_counters_follow_inserts_and_claims(add_puzzles):
+    add_puzzles(5)
+    assert DatabaseService.pool_stats() == counted() == {"total": 5, "unassigned": 5, "assigned": 0}
+
+    DatabaseService.claim(["a", "b"])
+    assert DatabaseService.pool_stats() == counted() == {"total": 5, "unassigned": 3, "assigned": 2}
+
+    DatabaseService.claim(["a", "b"])  # Already assigned: nothing changes
+    assert DatabaseService.pool_stats() == counted()
+
+
+def test_counters_follow_deletes(add_puzzles):
+    add_puzzles(4)
+    DatabaseService.claim(["a"])
+
+    with session_scope() as session:
+        session.execute(text("DELETE FROM time_lock_puzzles WHERE request_id = 'a'"))
+        session.execute(
+            text(
+                "DELETE FROM time_lock_puzzles WHERE id = "
+                "(SELECT id FROM time_lock_puzzles WHERE request_id IS NULL LIMIT 1)"
+            )
+        )
+
+    assert DatabaseService.pool_stats() == counted() == {"total": 2, "unassigned": 2, "assigned": 0}
+
+
+def test_counters_follow_the_purge(add_puzzles):
+    add_puzzles(5)
+    DatabaseService.claim(["old", "recent", "running"])
+    complete(["old"], days_ago=30)
+    complete(["recent"], days_ago=0)
+
+    report = purge_completed(retention_seconds=7 * 24 * 3600, pause_seconds=0)
+
+    assert report.puzzles == 1
+    assert DatabaseService.pool_stats() == counted() == {"total": 4, "unassigned": 2, "assigned": 2}
+
+
+def test_reinstalling_recounts_and_keeps_counting(database, add_puzzles):
+    add_puzzles(3)
+    DatabaseService.claim(["a"])
+    with session_scope() as session:
+        session.execute(text("UPDATE pool_stats SET total = 100, unassigned = -7"))
+    assert DatabaseService.pool_stats() != counted()
+
+    install_pool_stats(database)
+    assert DatabaseService.pool_stats() == counted() == {"total": 3, "unassigned": 2, "assigned": 1}
+
+    install_pool_stats(database)  # Re-running neither doubles the triggers nor the counts
+    add_puzzles(2)
+    DatabaseService.claim(["b"])
+    assert DatabaseService.pool_stats() == counted() == {"total": 5, "unassigned": 3, "assigned": 2}
@@ -0,0 +1,90 @@
+"""Tests for the chunked retention purge on SQLite."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import text, update
+
+import src.database.purge_completed as purge_module
+from src.database.DatabaseService import DatabaseService
+from src.database.database import session_scope
+from src.database.entity import TimeLockPuzzleEntity
+from src.database.purge_completed import purge_completed
+
+WEEK = 7 * 24 * 3600
+
+
+def complete(request_ids, days_ago):
+    with session_scope() as session:
+        session.execute(
+            update(TimeLockPuzzleEntity)
+            .where(TimeLockPuzzleEntity.request_id.in_(request_ids))
+            .values(detected_completed=datetime.utcnow() - timedelta(days=days_ago))
+        )
+
+
+def counts():
+    with session_scope() as session:
+        return (
+            session.execute(text("SELECT count(*) FROM time_lock_puzzles")).scalar(),
+            session.execute(text("SELECT count(*) FROM rsa_keys")).scalar(),
+        )
+
+
+def old_and_recent(add_puzzles, old):
+    """`old` puzzles completed a month ago, one completed today, one running and one unassigned."""
+    add_puzzles(old + 3)
+    old_ids = [f"old{i}" for i in range(old)]
+    DatabaseService.claim([*old_ids, "recent", "running"])
+    complete(old_ids, days_ago=30)
+    complete(["recent"], days_ago=0)
+
+
+def test_purge_deletes_only_puzzles_completed_before_the_cutoff(add_puzzles):
+    old_and_recent(add_puzzles, old=5)
+
+    report = purge_completed(retention_seconds=WEEK, chunk_size=2, pause_seconds=0)
+
+    assert (report.puzzles, report.keys, report.chunks) == (5, 5, 3)
+    assert counts() == (3, 3)
+    assert set(DatabaseService.claim(["recent", "running"])) == {"recent", "running"}
+
+
+def test_dry_run_reports_without_deleting(add_puzzles):
+    old_and_recent(add_puzzles, old=5)
+
+    report = purge_completed(retention_seconds=WEEK, chunk_size=2, dry_run=True)
+
+    assert (report.puzzles, report.keys, report.chunks) == (5, 5, 3)
+    assert counts() == (8, 8)
+
+
+def test_max_chunks_stops_early(add_puzzles):
+    old_and_recent(add_puzzles, old=5)
+
+    report = purge_completed(retention_seconds=WEEK, chunk_size=2, pause_seconds=0, max_chunks=2)
+    assert (report.puzzles, report.chunks) == (4, 2)
+    assert counts() == (4, 4)
+
+    dry = purge_completed(retention_seconds=WEEK, chunk_size=2, dry_run=True, max_chunks=0)
+    assert (dry.puzzles, dry.chunks) == (0, 0)
+
+
+def test_a_chunk_shortened_by_skipped_rows_does_not_end_the_run(add_puzzles, monkeypatch):
+    old_and_recent(add_puzzles, old=5)
+    # The first chunk comes back short, as if SKIP LOCKED passed over rows another transaction
+    # held; the rows are free again for the next chunk
+    real_chunk = purge_module._purge_chunk
+    sizes = []
+
+    def chunk(cutoff, chunk_size):
+        deleted = real_chunk(cutoff, 1 if not sizes else chunk_size)
+        sizes.append(deleted)
+        return deleted
+
+    monkeypatch.setattr(purge_module, "_purge_chunk", chunk)
+
+    report = purge_completed(retention_seconds=WEEK, chunk_size=3, pause_seconds=0)
+
+    assert sizes == [1, 3, 1, 0]
+    assert report.puzzles == 5
+    assert counts() == (3, 3)
@@ -0,0 +1,100 @@
+"""Tests for PuzzleIssuingService persistence on SQLite."""
+
+import asyncio
+import sys
+
+from sqlalchemy import text
+
+from src.database.DatabaseService import DatabaseService
+from src.database.database import session_scope
+from src.mpc import MPC
+from src.service.PuzzleIssuingService import ISSUED_REQUEST_PREFIX, PuzzleIssuingService
+
+# The package re-exports the class under the module's name
+issuing_module = sys.modules[PuzzleIssuingService.__module__]
+
+
+def stored_request_ids():
+    with session_scope() as session:
+        return dict(session.execute(text("SELECT id, request_id FROM time_lock_puzzles")).all())
+
+
+def rsa_key_count():
+    with session_scope() as session:
+        return session.execute(text("SELECT count(*) FROM rsa_keys")).scalar()
+
+
+async def wait_for_buffer(service, depth):
+    while service.stats()["buffer_depth"] < depth:
+        await asyncio.sleep(0.05)
+
+
+def new_service(capacity):
+    return PuzzleIssuingService(256, MPC.mpz(100), capacity=capacity, persist_interval=0.05)
+
+
+def test_issued_puzzles_are_committed_as_taken_before_they_are_issued(database):
+    async def run():
+        service = new_service(2)
+        await service.start()
+        await wait_for_buffer(service, 2)
+        issued = service.issue(2)
+        stored = stored_request_ids()  # Before stop(): nothing is left to flush
+        await service.stop()
+        return issued, stored
+
+    issued, stored = asyncio.run(run())
+
+    assert len(issued) == 2
+    assert stored == {puzzle["id"]: f"{ISSUED_REQUEST_PREFIX}{puzzle['id']}" for puzzle in issued}
+    assert DatabaseService.pool_stats() == {"total": 2, "unassigned": 0, "assigned": 2}
+    assert DatabaseService.claim(["request"]) == {}
+
+
+def test_stop_deletes_the_puzzles_that_were_never_issued(database):
+    async def run():
+        service = new_service(3)
+        await service.start()
+        await wait_for_buffer(service, 3)
+        issued = service.issue(1)
+        await service.stop()
+        return issued
+
+    issued = asyncio.run(run())
+
+    assert list(stored_request_ids()) == [issued[0]["id"]]
+    assert rsa_key_count() == 1
+
+
+calls = []
+
+
+def flaky_create_puzzle(bit_size, t):
+    """Fails on its first call in each worker process."""
+    calls.append(t)
+    if len(calls) == 1:
+        raise RuntimeError("worker failed")
+    return original_create_puzzle(bit_size, t)
+
+
+original_create_puzzle = issuing_module._create_puzzle
+
+
+def test_a_failed_refill_is_logged_and_restarted(database, monkeypatch, capsys):
+    # Patched before the worker process is forked, so the worker sees it
+    monkeypatch.setattr(issuing_module, "_create_puzzle", flaky_create_puzzle)
+
+    async def run():
+        service = new_service(1)
+        await service.start()
+        await asyncio.wait_for(wait_for_buffer(service, 1), 30)
+        stats = service.stats()
+        await service.stop()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats["refill_failures"] == 1
+    assert stats["buffer_depth"] == 1
+    output = capsys.readouterr()
+    assert "worker failed" in output.out + output.err
@@ -0,0 +1,93 @@
+"""Tests for the solver service's ResultCache."""
+
+import os
+
+from src.mpc import MPC
+from src.service.ResultCache import ResultCache
+
+Y = "ab" * 50  # 100 bytes per entry
+
+
+def key(i):
+    return ResultCache.key(MPC.mpz(i), MPC.mpz(1000), MPC.mpz(77))
+
+
+def path(directory, cache_key):
+    return os.path.join(directory, cache_key[:2], cache_key)
+
+
+def test_key_ignores_how_the_numbers_were_written():
+    assert ResultCache.key(MPC.mpz(255), MPC.mpz(10), MPC.mpz(77)) == ResultCache.key(
+        255, 10, 77
+    )
+    assert ResultCache.key(255, 10, 77) != ResultCache.key(255, 11, 77)
+
+
+def test_put_and_get(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1000)
+    cache.put(key(1), Y)
+
+    assert cache.get(key(1)) == Y
+    assert cache.get(key(2)) is None
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 100,
+        "max_bytes": 1000,
+        "hits": 1,
+        "misses": 1,
+    }
+
+
+def test_evicts_least_recently_used_entries_over_the_size_limit(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=250)
+    cache.put(key(1), Y)
+    cache.put(key(2), Y)
+    cache.get(key(1))  # key(2) is now the least recently used
+
+    cache.put(key(3), Y)
+
+    assert cache.get(key(2)) is None
+    assert not os.path.exists(path(str(tmp_path), key(2)))
+    assert cache.get(key(1)) == Y
+    assert cache.get(key(3)) == Y
+    assert cache.stats()["bytes"] == 200
+
+
+def test_recency_is_rebuilt_from_file_mtimes_on_restart(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=250)
+    for i in (1, 2):
+        cache.put(key(i), Y)
+    # key(1) was used last, even though it was written first
+    os.utime(path(str(tmp_path), key(1)), (2_000_000_000, 2_000_000_000))
+    os.utime(path(str(tmp_path), key(2)), (1_000_000_000, 1_000_000_000))
+
+    restarted = ResultCache(str(tmp_path), max_bytes=250)
+    assert restarted.stats()["entries"] == 2
+    assert restarted.stats()["bytes"] == 200
+    restarted.put(key(3), Y)
+
+    assert restarted.get(key(2)) is None
+    assert restarted.get(key(1)) == Y
+
+
+def test_restart_ignores_partial_writes(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put(key(1), Y)
+    with open(path(str(tmp_path), key(1)) + ".123.456.tmp", "w") as f:
+        f.write("partial")
+
+    assert ResultCache(str(tmp_path)).stats()["entries"] == 1
+
+
+def test_a_file_removed_behind_the_cache_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put(key(1), Y)
+    os.remove(path(str(tmp_path), key(1)))
+
+    assert cache.get(key(1)) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+    assert cache.stats()["misses"] == 1
+
+    cache.put(key(1), Y)  # Can be stored again
+    assert cache.get(key(1)) == Y
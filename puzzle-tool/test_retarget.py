@@ -0,0 +1,103 @@
+"""Tests for PuzzleRetargeter on SQLite."""
+
+from sqlalchemy import text
+
+from generate import TimeLockPuzzleService
+from src.database.DatabaseService import DatabaseService
+from src.database.PuzzleRetargeter import PuzzleRetargeter
+from src.database.database import session_scope
+from src.mpc import MPC
+from src.time_lock_puzzle.EfficientTimeLockPuzzleSolver import EfficientTimeLockPuzzleSolver
+from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
+
+T = 1000
+
+
+def add_real_puzzles(count):
+    service = TimeLockPuzzleService(256, MPC.mpz(100))
+    puzzles = [service.factory.create_puzzle() for _ in range(count)]
+    DatabaseService.save_many(service.convert_to_entities(puzzles))
+
+
+def stored_puzzles():
+    with session_scope() as session:
+        return {
+            row["id"]: row
+            for row in session.execute(
+                text(
+                    "SELECT tlp.id, x, y, t, tlp.modulus, request_id, p, q "
+                    "FROM time_lock_puzzles tlp JOIN rsa_keys ON rsa_keys.id = tlp.rsa_id"
+                )
+            ).mappings()
+        }
+
+
+def expected_y(row, t):
+    puzzle = TimeLockPuzzle(
+        MPC.mpz(int(row["x"], 16)), MPC.mpz(t), MPC.mpz(int(row["modulus"], 16))
+    )
+    y = EfficientTimeLockPuzzleSolver.solve_with_factors(
+        MPC.mpz(int(row["p"], 16)), MPC.mpz(int(row["q"], 16)), puzzle
+    )
+    return hex(y)[2:]
+
+
+def test_retargets_every_unassigned_puzzle(database):
+    add_real_puzzles(5)
+
+    report = PuzzleRetargeter(workers=2, batch_size=2).retarget(T)
+
+    assert (report.puzzles, report.skipped, report.failed, report.batches) == (5, 0, 0, 3)
+    for row in stored_puzzles().values():
+        assert row["t"] == str(T)
+        assert row["y"] == expected_y(row, T)
+
+
+def test_claimed_puzzles_are_left_as_they_were(database):
+    add_real_puzzles(3)
+    claimed_id = DatabaseService.claim(["request"])["request"]
+    before = stored_puzzles()[claimed_id]
+
+    report = PuzzleRetargeter(workers=1).retarget(T)
+
+    assert report.puzzles == 2
+    assert stored_puzzles()[claimed_id] == before
+
+
+def test_a_rerun_only_reads_puzzles_not_yet_at_t(database):
+    add_real_puzzles(3)
+    PuzzleRetargeter(workers=1).retarget(T)
+    with session_scope() as session:  # As if the first run had stopped before this puzzle
+        session.execute(
+            text(
+                "UPDATE time_lock_puzzles SET t = '100' "
+                "WHERE id = (SELECT min(id) FROM time_lock_puzzles)"
+            )
+        )
+
+    report = PuzzleRetargeter(workers=1).retarget(T)
+
+    assert (report.puzzles, report.batches) == (1, 1)
+    assert all(row["t"] == str(T) for row in stored_puzzles().values())
+
+
+def test_a_failed_batch_is_reported_and_the_run_goes_on(database, capsys):
+    add_real_puzzles(3)
+    with session_scope() as session:
+        broken_id = session.execute(text("SELECT min(id) FROM time_lock_puzzles")).scalar()
+        session.execute(
+            text(
+                "UPDATE rsa_keys SET p = 'not hex' "
+                "WHERE id = (SELECT rsa_id FROM time_lock_puzzles WHERE id = :id)"
+            ),
+            {"id": broken_id},
+        )
+
+    report = PuzzleRetargeter(workers=1, batch_size=1).retarget(T)
+
+    assert (report.puzzles, report.failed, report.failed_batches, report.batches) == (2, 1, 1, 2)
+    assert "1 puzzles in 1 failed batch(es)" in str(report)
+    assert "failed" in capsys.readouterr().out
+    rows = stored_puzzles()
+    assert rows.pop(broken_id)["t"] == "100"
+    assert all(row["t"] == str(T) for row in rows.values())
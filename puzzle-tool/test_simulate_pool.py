@@ -0,0 +1,105 @@
+"""Smoke tests for the pool sizing simulator: arrival streams and the watermark refill policy."""
+
+import random
+import subprocess
+
+from simulate_pool import (
+    PoolSimulator,
+    SimulationReport,
+    bursty_arrivals,
+    poisson_arrivals,
+    trace_arrivals,
+)
+from src.database.DatabaseService import DatabaseService
+
+
+def test_poisson_arrivals_are_ascending_within_the_duration():
+    arrivals = poisson_arrivals(50, 100, random.Random(1))
+
+    assert arrivals == sorted(arrivals)
+    assert 0 < arrivals[0] and arrivals[-1] < 100
+    assert 4500 < len(arrivals) < 5500
+    assert arrivals == poisson_arrivals(50, 100, random.Random(1))
+
+
+def test_bursty_arrivals_crowd_into_the_bursts():
+    arrivals = bursty_arrivals(1, 50, 10, 60, 600, random.Random(1))
+
+    in_bursts = [arrival for arrival in arrivals if arrival % 60 < 10]
+    assert all(0 <= arrival < 600 for arrival in arrivals)
+    assert len(in_bursts) > 5 * (len(arrivals) - len(in_bursts))
+
+
+def test_trace_arrivals_are_offsets_from_the_first_request(tmp_path):
+    trace = tmp_path / "trace.txt"
+    trace.write_text("# unix seconds\n1000.5\n\n1000.0\n1002.0\n1030.0\n")
+
+    assert trace_arrivals(str(trace), None) == [0.0, 0.5, 2.0, 30.0]
+    assert trace_arrivals(str(trace), 10) == [0.0, 0.5, 2.0]
+
+
+class FakeRefill:
+    """Stands in for a generate.py process until `finish` is called."""
+
+    started = []
+
+    def __init__(self, command, **_kwargs):
+        self.command = command
+        self.returncode = None
+        FakeRefill.started.append(self)
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        return self.returncode
+
+    def finish(self, returncode=0):
+        self.returncode = returncode
+
+
+def test_refills_start_below_the_low_watermark_up_to_the_generator_limit(
+    add_puzzles, monkeypatch
+):
+    monkeypatch.setattr(subprocess, "Popen", FakeRefill)
+    FakeRefill.started = []
+    add_puzzles(3)
+    simulator = PoolSimulator(low_watermark=10, refill_batch=4, generators=3)
+    report = SimulationReport()
+
+    simulator._poll(report, 0.0, 0)
+    # 3 unassigned + 4 on their way is still below 10; + 8 is not
+    assert len(FakeRefill.started) == 2
+    assert FakeRefill.started[0].command[-1] == "4"
+    simulator._poll(report, 1.0, 0)
+    assert len(FakeRefill.started) == 2
+
+    FakeRefill.started[0].finish()
+    FakeRefill.started[1].finish(returncode=1)
+    simulator._poll(report, 2.0, 0)
+    assert len(report.refills) == 1 and report.failed_refills == 1
+    assert len(FakeRefill.started) == 4
+    assert report.timeline == [(0.0, 3, 0, 0), (1.0, 3, 0, 2), (2.0, 3, 0, 0)]
+
+
+def test_no_refill_at_or_above_the_low_watermark(add_puzzles, monkeypatch):
+    monkeypatch.setattr(subprocess, "Popen", FakeRefill)
+    FakeRefill.started = []
+    add_puzzles(5)
+
+    PoolSimulator(low_watermark=5, refill_batch=4)._poll(SimulationReport(), 0.0, 0)
+
+    assert FakeRefill.started == []
+
+
+def test_run_serves_every_request_from_the_pool(add_puzzles, monkeypatch):
+    monkeypatch.setattr(subprocess, "Popen", FakeRefill)
+    add_puzzles(3)
+
+    report = PoolSimulator(low_watermark=1, refill_batch=4, poll_seconds=0.05).run([0.0, 0.05])
+
+    assert report.requests == 2
+    assert len(report.latencies) == 2
+    assert report.stockouts == []
+    assert "Stockouts: none" in str(report)
+    assert DatabaseService.pool_stats()["unassigned"] == 1
@@ -0,0 +1,111 @@
+"""Tests for SolverHandle, the asyncio handle of a solve in a worker process."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.mpc import MPC
+from src.time_lock_puzzle.SolverHandle import SolverHandle
+from src.time_lock_puzzle.TimeLockPuzzle import TimeLockPuzzle
+
+N = 1_000_003 * 1_000_033
+X = 5
+
+
+def puzzle(t):
+    return TimeLockPuzzle(MPC.mpz(X), MPC.mpz(t), MPC.mpz(N))
+
+
+def expected(t):
+    return pow(X, pow(2, t, (1_000_003 - 1) * (1_000_033 - 1)), N)
+
+
+async def wait_until(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_result_is_the_solution():
+    async def run():
+        handle = SolverHandle.start(puzzle(5000), step=100)
+        return await handle.result(), handle.done
+
+    y, done = asyncio.run(run())
+
+    assert y == expected(5000)
+    assert done
+
+
+def test_zero_squarings_returns_x():
+    async def run():
+        handle = SolverHandle.start(puzzle(0))
+        return await handle.result()
+
+    assert asyncio.run(run()) == X
+
+
+def test_progress_streams_until_the_solve_finishes():
+    async def run():
+        handle = SolverHandle.start(puzzle(20_000), step=100, progress_interval=0)
+        events = [event async for event in handle.progress()]
+        return events, await handle.result(), handle.latest_progress
+
+    events, y, latest = asyncio.run(run())
+
+    assert y == expected(20_000)
+    assert events
+    done = [event.squarings_done for event in events]
+    assert done == sorted(done)
+    assert all(event.squarings_total == 20_000 for event in events)
+    assert all(not event.paused and event.rate > 0 for event in events)
+    assert events[-1].eta_seconds == pytest.approx(
+        (20_000 - events[-1].squarings_done) / events[-1].rate
+    )
+    assert latest == events[-1]
+
+
+def test_pause_stops_squaring_until_resume():
+    async def run():
+        handle = SolverHandle.start(puzzle(10**9), step=1000, progress_interval=0)
+        await wait_until(lambda: handle.latest_progress is not None)
+        handle.pause()
+        await wait_until(lambda: handle.latest_progress.paused)
+        paused_at = handle.latest_progress.squarings_done
+        await asyncio.sleep(0.3)
+        still_paused = handle.latest_progress
+        handle.resume()
+        await wait_until(lambda: handle.latest_progress.squarings_done > paused_at)
+        resumed = handle.latest_progress
+        handle.cancel()
+        return paused_at, still_paused, resumed
+
+    paused_at, still_paused, resumed = asyncio.run(run())
+
+    assert still_paused.paused
+    assert still_paused.squarings_done == paused_at
+    assert not resumed.paused
+
+
+@pytest.mark.parametrize("paused", [False, True])
+def test_cancel_ends_the_solve_and_its_progress_stream(paused):
+    async def run():
+        handle = SolverHandle.start(puzzle(10**9), step=1000, progress_interval=0)
+        events = handle.progress()
+        await events.__anext__()
+        if paused:
+            handle.pause()
+        handle.cancel()
+        rest = [event async for event in events]
+        with pytest.raises(asyncio.CancelledError):
+            await handle.result()
+        await wait_until(lambda: not handle._process.is_alive())
+        return handle, rest
+
+    handle, rest = asyncio.run(run())
+
+    assert handle.done
+    assert all(event.squarings_done < 10**9 for event in rest)
+    assert handle._process.exitcode == 0